@@ -1,6 +1,9 @@
 import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
+import isosurface_mesh
+import h2_density_stack
+import rhf
 
 # Constants
 a0 = 1.0  # Bohr radius in arbitrary units
@@ -9,27 +12,43 @@ def psi_1s(r):
     """Calculate the wavefunction of 1s orbital."""
     return (np.pi**-0.5) * np.exp(-r/a0)
 
-def plot_3d_psi(R, phase):
+def plot_3d_psi(R, phase, resolution=50, mode='Server mesh', step_size=1, precomputed=True, molecule=None):
     # Grid setup
-    x = np.linspace(-5, 5, 50)  # Reduced for performance in surface plot
-    y = np.linspace(-5, 5, 50)
-    z = np.linspace(-5, 5, 50)
-    X, Y, Z = np.meshgrid(x, y, z)
-    
-    # Positions of the two hydrogen atoms
-    R1 = np.sqrt((X + R/2)**2 + Y**2 + Z**2)  # Hydrogen 1
-    R2 = np.sqrt((X - R/2)**2 + Y**2 + Z**2)  # Hydrogen 2
-
-    # Calculate wavefunction for both atoms
-    if phase == 'In-Phase':
-        Psi = psi_1s(R1)**2 + psi_1s(R2)**2
-    else:  # Out-of-Phase
-        Psi = np.abs(psi_1s(R1)**2 - psi_1s(R2)**2)  # Absolute value to visualize the density
+    x = np.linspace(-5, 5, resolution)
+    y = np.linspace(-5, 5, resolution)
+    z = np.linspace(-5, 5, resolution)
+
+    if molecule is not None:
+        # Self-consistent STO-3G molecular orbital: bonding (In-Phase) or antibonding sigma
+        Psi = rhf.orbital_density(molecule, R, x, orbital=0 if phase == 'In-Phase' else 1)
+    elif precomputed:
+        # Slice the memory-mapped separation sweep instead of recomputing the distance fields
+        Psi = h2_density_stack.get_stack(resolution).density(R, phase)
+    else:
+        X, Y, Z = np.meshgrid(x, y, z, indexing='ij')
+
+        # Positions of the two hydrogen atoms
+        R1 = np.sqrt((X + R/2)**2 + Y**2 + Z**2)  # Hydrogen 1
+        R2 = np.sqrt((X - R/2)**2 + Y**2 + Z**2)  # Hydrogen 2
+
+        # Calculate wavefunction for both atoms
+        if phase == 'In-Phase':
+            Psi = psi_1s(R1)**2 + psi_1s(R2)**2
+        else:  # Out-of-Phase
+            Psi = np.abs(psi_1s(R1)**2 - psi_1s(R2)**2)  # Absolute value to visualize the density
 
     # Visualization threshold for the isosurface
     threshold = Psi.max()/10  # Adjust if needed for clearer visualization
 
-    # Create a 3D isosurface plot
+    if mode == 'Server mesh':
+        # Extract the triangles here and ship a compact float32/int32 Mesh3d
+        levels = np.linspace(threshold, Psi.max(), 3)[:-1]
+        fig = isosurface_mesh.mesh_figure(Psi, x, y, z, levels, step_size=step_size)
+        fig.update_layout(margin=dict(l=0, r=0, b=0, t=0), scene=dict(aspectmode='cube'))
+        return fig
+
+    # Create a 3D isosurface plot (the browser does the marching)
+    X, Y, Z = np.meshgrid(x, y, z, indexing='ij')
     fig = go.Figure(data=go.Isosurface(
         x=X.flatten(),
         y=Y.flatten(),
@@ -48,6 +67,20 @@ def plot_3d_psi(R, phase):
 
     return fig
 
+def plot_dissociation_curve(molecule, R):
+    R_values, energies, seconds = rhf.dissociation_curve(molecule)
+    energy = rhf.solve(molecule, R)[0]
+    fig = go.Figure(go.Scatter(x=R_values, y=energies, mode='lines', name='RHF/STO-3G'))
+    fig.add_trace(go.Scatter(x=[R], y=[energy], mode='markers', marker=dict(size=10),
+                             name='Current separation'))
+    # The curve climbs to several hartree at the shortest R: show 1 hartree above the minimum,
+    # widened to the marker when the slider is there
+    low, high = energies.min(), max(energy, energies.min() + 1.0)
+    fig.update_layout(xaxis_title='R (bohr)', yaxis_title='Total energy (hartree)',
+                      yaxis_range=[low - 0.05 * (high - low), high + 0.05 * (high - low)],
+                      margin=dict(l=0, r=0, b=0, t=30), title=f'{molecule} dissociation curve')
+    return fig, seconds
+
 def main():
 
 # Streamlit app setup
@@ -58,9 +91,33 @@ def main():
 # Using the slider to automatically update the plot
     R = st.slider('Separation distance between hydrogen atoms (in a.u.)', 0.1, 5.0, 2.0, on_change=None)
 
-    fig = plot_3d_psi(R, phase)
+    model = st.radio("Density model:", ('Sum of atomic 1s densities', 'Hartree-Fock (STO-3G)'))
+    molecule = st.radio("Molecule:", tuple(rhf.MOLECULES)) if model == 'Hartree-Fock (STO-3G)' else None
+
+    mode = st.radio("Rendering:", ('Server mesh', 'Browser isosurface'))
+    precomputed = molecule is None and st.checkbox('Use precomputed separation sweep', value=True)
+    if precomputed:
+        # Stacks exist for a few fixed grids only, so dragging does not build a new one per position
+        resolution = st.select_slider('Grid points per axis', h2_density_stack.STACK_RESOLUTIONS, 60)
+    else:
+        resolution = st.slider('Grid points per axis', 20, 120, 50)
+    step_size = st.slider('Mesh coarsening (voxels per step)', 1, 4, 1) if mode == 'Server mesh' else 1
+
+    if precomputed:
+        stack = h2_density_stack.get_stack(resolution)
+        st.caption(f"Density stack: {stack.nbytes / 1e6:.1f} MB, built in {stack.build_seconds:.2f} s")
+
+    fig = plot_3d_psi(R, phase, resolution, mode, step_size, precomputed, molecule)
     st.plotly_chart(fig, use_container_width=True)
 
+    if molecule is not None:
+        curve, seconds = plot_dissociation_curve(molecule, R)
+        st.plotly_chart(curve, use_container_width=True)
+        energy, orbital_energies = rhf.solve(molecule, R)[:2]
+        st.caption(f"E = {energy:.6f} hartree at R = {R:.2f} bohr; orbital energies "
+                   f"{orbital_energies[0]:.4f}, {orbital_energies[1]:.4f}; "
+                   f"{len(curve.data[0].x)}-point curve computed in {seconds:.2f} s")
+
 
 
 if __name__ == "__main__":
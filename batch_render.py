@@ -0,0 +1,159 @@
+import argparse
+import base64
+import inspect
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import simulations
+
+FORMATS = ('png', 'html', 'npz')
+
+# Each worker process keeps one PageFigure per page, so a matplotlib sweep updates the
+# artists in place instead of rebuilding the figure for every point
+_figures = {}
+
+
+def parse_value(text):
+    for kind in (int, float):
+        try:
+            return kind(text)
+        except ValueError:
+            pass
+    return None if text == 'None' else text
+
+
+def parse_param(text):
+    """'name=start:stop:step' (inclusive range), 'name=start:stop' (integer steps) or 'name=a,b,c'."""
+    name, _, spec = text.partition('=')
+    if not name or not spec:
+        raise argparse.ArgumentTypeError(f"expected name=values, got {text!r}")
+    if ':' in spec:
+        start, stop, *step = (parse_value(part) for part in spec.split(':'))
+        step = step[0] if step else 1
+        n = int(round((stop - start) / step)) + 1
+        values = [start + i * step for i in range(n)]
+        if not all(isinstance(v, int) for v in (start, stop, step)):
+            values = [round(v, 10) for v in values]  # 0.1 + 2 * 0.1 -> 0.3 in file names
+        return name, values
+    return name, [parse_value(part) for part in spec.split(',')]
+
+
+def parameter_grid(page, params):
+    """Every combination of the swept values that the page accepts."""
+    valid = simulations.PAGES[page]['valid']
+    names = list(params)
+    for values in itertools.product(*(params[name] for name in names)):
+        point = dict(zip(names, values))
+        if valid is None or valid(point):
+            yield point
+
+
+def file_stem(page, point):
+    parts = [f"{name}-{value:g}" if isinstance(value, float) else f"{name}-{value}" for name, value in point.items()]
+    return '_'.join([page] + parts).replace(' ', '').replace(',', '').replace('/', '')
+
+
+def split_params(page, point):
+    """Route each parameter to the compute function or, e.g. a rendering mode, to the figure builder."""
+    spec = simulations.PAGES[page]
+    build_names = set(inspect.signature(spec['build']).parameters) - {'data', 'page_figure'}
+    compute = {k: v for k, v in point.items() if k not in build_names}
+    build = {k: v for k, v in point.items() if k in build_names}
+    return compute, build
+
+
+def save_npz(path, data, point):
+    arrays = {f'param_{name}': np.asarray(value) for name, value in point.items() if value is not None}
+    for name, value in data.items():
+        if isinstance(value, (np.ndarray, int, float, str)):
+            arrays[name] = np.asarray(value)
+    np.savez_compressed(path, **arrays)
+
+
+def render(page, point, formats, out_dir):
+    """Compute one parameter point and write its outputs; returns (written paths, seconds)."""
+    start = time.perf_counter()
+    spec = simulations.PAGES[page]
+    compute_params, build_params = split_params(page, point)
+    data = spec['compute'](**compute_params)
+    stem = os.path.join(out_dir, file_stem(page, point))
+    written = []
+
+    if 'npz' in formats:
+        save_npz(stem + '.npz', data, point)
+        written.append(stem + '.npz')
+
+    if spec['kind'] == 'matplotlib' and {'png', 'html'} & set(formats):
+        import figure_cache
+
+        page_figure = _figures.get(page)
+        if page_figure is None:
+            page_figure = _figures[page] = figure_cache.PageFigure(spec['figsize'])
+        png = figure_cache.render_png(spec['build'](data, page_figure, **build_params))
+        if 'png' in formats:
+            with open(stem + '.png', 'wb') as f:
+                f.write(png)
+            written.append(stem + '.png')
+        if 'html' in formats:
+            with open(stem + '.html', 'w') as f:
+                f.write(f'<html><body><img src="data:image/png;base64,{base64.b64encode(png).decode()}">'
+                        '</body></html>\n')
+            written.append(stem + '.html')
+    elif spec['kind'] == 'plotly' and {'png', 'html'} & set(formats):
+        fig = spec['build'](data, **build_params)
+        if 'html' in formats:
+            fig.write_html(stem + '.html', include_plotlyjs='cdn')
+            written.append(stem + '.html')
+        if 'png' in formats:
+            fig.write_image(stem + '.png')  # needs kaleido
+            written.append(stem + '.png')
+    return written, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Render a main_app page over a parameter grid in a process pool.",
+        epilog="examples:\n"
+               "  python batch_render.py rigid_rotor --param l=0:20 --param m=-20:20\n"
+               "  python batch_render.py hydrogen_orbitals --param R=0.1:5.0:0.1 --param molecule=H2 "
+               "--formats html npz",
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('page', choices=sorted(simulations.PAGES))
+    parser.add_argument('--param', type=parse_param, action='append', default=[], metavar='NAME=VALUES',
+                        help="swept parameter: start:stop[:step] (inclusive) or a,b,c; repeat for a grid")
+    parser.add_argument('--formats', nargs='+', choices=FORMATS, default=['png', 'npz'])
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--out', default='renders', help="output directory (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    if simulations.PAGES[args.page]['kind'] == 'plotly' and 'png' in args.formats:
+        try:
+            import kaleido  # noqa: F401
+        except ImportError:
+            parser.error("PNG export of Plotly pages needs the kaleido package; use --formats html npz")
+
+    params = dict(args.param)
+    unknown = set(params) - set(inspect.signature(simulations.PAGES[args.page]['compute']).parameters) \
+        - set(split_params(args.page, params)[1])
+    if unknown:
+        parser.error(f"{args.page} has no parameter(s) {', '.join(sorted(unknown))}")
+
+    points = list(parameter_grid(args.page, params))
+    os.makedirs(args.out, exist_ok=True)
+    start = time.perf_counter()
+    n_files = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        jobs = pool.map(render, itertools.repeat(args.page), points, itertools.repeat(args.formats),
+                        itertools.repeat(args.out), chunksize=max(1, len(points) // (4 * (args.workers or 1))))
+        for point, (written, seconds) in zip(points, jobs):
+            n_files += len(written)
+            print(f"{seconds:7.2f} s  {', '.join(os.path.basename(path) for path in written)}")
+    print(f"{len(points)} parameter points, {n_files} files in {time.perf_counter() - start:.1f} s -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+from matplotlib.figure import Figure
+
+# Every compute kernel the apps run, each at a few problem sizes. A run records the best
+# wall time of the kernel over the repeats, the peak traced memory of one extra run, and the
+# size of what the page would ship: the PNG or Plotly JSON of its figure. Kernels that return
+# arrays register how their page draws them. Building and serializing the figure is not part
+# of the timed region.
+#
+#   python benchmarks.py                 compare against the stored baseline, exit 1 on regression
+#   python benchmarks.py --update        measure and overwrite the baseline
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+
+# Allowed growth over the baseline before a result counts as a regression
+TIME_THRESHOLD = 0.5
+MEMORY_THRESHOLD = 0.25
+PAYLOAD_THRESHOLD = 0.1
+# Timings below this are scheduler noise and are compared as if they took this long; a kernel
+# of a few tens of ms can still lose a whole time slice on a busy single-core machine
+MIN_SECONDS = 0.05
+
+# name -> (run(size), sizes, figure(result, size) or None)
+KERNELS = {}
+
+
+def kernel(*sizes, figure=None):
+    """Register run(size) under its function name; sizes are the problem sizes to measure.
+
+    figure(result, size) draws an array result the way its page does, for the payload size.
+    """
+    def register(run):
+        KERNELS[run.__name__] = (run, sizes, figure)
+        return run
+    return register
+
+
+def clear_caches():
+    """Drop the memoized results the kernels would otherwise reuse between runs."""
+    import oscillator_engine
+    import schrodinger_1d
+    import spherical_harmonics
+
+    oscillator_engine.eigenstates.cache_clear()
+    spherical_harmonics.table.cache_clear()
+    with schrodinger_1d._lock:
+        schrodinger_1d._solutions.clear()
+
+
+@kernel(5, 50, 200)
+def oscillator_wavefunction(n_levels):
+    import figure_cache
+    import simulations
+
+    data = simulations.harmonic_oscillator(1.0, 1.0, n_levels)
+    return simulations.draw_harmonic_oscillator(data, figure_cache.PageFigure((12, 8)))
+
+
+@kernel(30, 50, 80)
+def plot_3d_psi(resolution):
+    import simulations
+
+    data = simulations.hydrogen_orbitals(2.0, 'In-Phase', resolution, precomputed=False)
+    return simulations.surface_hydrogen_orbitals(data)
+
+
+@kernel((50, 100), (100, 200), (200, 400))
+def rigid_rotor_surface(grid):
+    import spherical_harmonics
+    import simulations
+
+    n_polar, n_azimuth = grid
+    Y_table = spherical_harmonics.table(simulations.L_MAX, n_polar, n_azimuth)
+    phi, theta = np.meshgrid(Y_table.polar, Y_table.azimuth, indexing='ij')
+    r = np.abs(Y_table(3, 2))
+    return simulations.surface_rigid_rotor(dict(
+        x=r * np.sin(phi) * np.cos(theta), y=r * np.sin(phi) * np.sin(theta), z=r * np.cos(phi),
+        axis_range=[-r.max(), r.max()], title='Wavefunction for l = 3, m = 2'))
+
+
+def planck_page(radiance, shape):
+    # uv_catastrophe_app: one curve per temperature over a strip of their colours
+    import blackbody
+
+    n_temperatures, n_wavelengths = shape
+    fig = Figure(figsize=(6.4, 5.2), layout='constrained')
+    ax, strip = fig.subplots(2, 1, height_ratios=[12, 1])
+    ax.plot(np.linspace(1, 3000, n_wavelengths), radiance.T)
+    strip.imshow(blackbody.srgb(np.linspace(300, 10_000, n_temperatures))[None], aspect='auto')
+    return fig
+
+
+@kernel((1, 500), (40, 500), (40, 10_000), figure=planck_page)
+def planck(shape):
+    import blackbody
+
+    n_temperatures, n_wavelengths = shape
+    return blackbody.planck(np.linspace(1e-9, 3e-6, n_wavelengths), np.linspace(300, 10_000, n_temperatures))
+
+
+def double_slit_page(result, n_wavelengths):
+    # double-slit-electron.py: the intensity over the screen's colour strip
+    import diffraction
+
+    intensity, XYZ = result
+    y = np.linspace(-0.01, 0.01, intensity.size)
+    fig = Figure(layout='constrained')
+    ax, strip = fig.subplots(2, 1, height_ratios=[4, 1], sharex=True)
+    ax.plot(y, intensity, color='blue')
+    strip.imshow(diffraction.color_strip(XYZ)[None], aspect='auto', extent=(y[0], y[-1], 0, 1))
+    return fig
+
+
+@kernel(1, 500, 5000, figure=double_slit_page)
+def double_slit_intensity(n_wavelengths):
+    import diffraction
+
+    wavelengths = np.linspace(380e-9, 780e-9, n_wavelengths)
+    y = np.linspace(-0.01, 0.01, 2000)
+    return diffraction.polychromatic_pattern(y, wavelengths, diffraction.led_spectrum(wavelengths), 2,
+                                             50e-6, 200e-6, 2.0)[:2]
+
+
+def tunneling_page(result, periods):
+    # Quantum Tunneling: the wavefunction chart and the transmission chart
+    psi, T, R = result
+    fig = Figure(figsize=(10, 8))
+    ax1, ax2 = fig.subplots(2, 1)
+    x = np.linspace(-10, 10, psi.size)
+    ax1.plot(x, psi.real)
+    ax1.plot(x, np.abs(psi)**2)
+    E = np.linspace(0.01, 3.0, T.size)
+    ax2.plot(E, T)
+    ax2.plot(E, R)
+    return fig
+
+
+@kernel(2, 20, 100, figure=tunneling_page)
+def tunneling(periods):
+    import transfer_matrix
+
+    barriers = transfer_matrix.superlattice(1.0, 0.5, 1.0, periods)
+    psi = barriers.wavefunction(np.linspace(-10, 10, 1000), 0.5)
+    return (psi,) + tuple(barriers.transmission(np.linspace(0.01, 3.0, 4000)))
+
+
+def finite_well_page(result, n_points):
+    # Particle in a Finite Potential Well: the potential and each state offset to its energy
+    energies, x, psi = result
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    ax.plot(x, np.where(np.abs(x) <= 1.0, 0.0, 10.0), color='black')
+    ax.plot(x, (psi + energies[:, None]).T)
+    return fig
+
+
+@kernel(1001, 4001, 16_001, figure=finite_well_page)
+def finite_well(n_points):
+    import schrodinger_1d
+
+    def potential(x):
+        return np.where(np.abs(x) <= 1.0, 0.0, 10.0)
+
+    return schrodinger_1d.solve(potential, -10.0, 10.0, 4, n_points)
+
+
+def franck_condon_page(result, n_ground):
+    # Franck-Condon Principle: the stick spectrum and its broadened envelope
+    lines, intensities, broadened = result
+    fig = Figure(figsize=(10, 4))
+    ax = fig.subplots()
+    ax.vlines(lines, 0, intensities, color='green', alpha=0.6)
+    ax.plot(np.linspace(lines.min(), lines.max(), broadened.size), broadened, color='black')
+    return fig
+
+
+@kernel(10, 40, 100, figure=franck_condon_page)
+def franck_condon(n_ground):
+    import vibronic
+
+    lines, intensities = vibronic.progression(n_ground, 3 * n_ground // 2, 0.5, 1.0, 0.8, kT=0.5)
+    return lines, intensities, vibronic.broaden(lines, intensities, np.linspace(lines.min(), lines.max(), 2000), 0.05)
+
+
+def gto_contraction_page(values, n_grid):
+    # GTOs.ipynb comparison: a slice through the nucleus and a line cut of the first function
+    middle = n_grid // 2
+    fig = Figure(figsize=(12, 5), layout='tight')
+    ax1, ax2 = fig.subplots(1, 2)
+    image = ax1.imshow(values[0, :, middle, :].T, origin='lower', cmap='RdBu', extent=[-5, 5, -5, 5])
+    fig.colorbar(image, ax=ax1)
+    ax2.plot(np.linspace(-5, 5, n_grid), values[0, :, middle, middle])
+    return fig
+
+
+@kernel(32, 64, 96, figure=gto_contraction_page)
+def gto_contraction(n_grid):
+    import gaussian_basis
+
+    axis = np.linspace(-5, 5, n_grid)
+    points = np.stack(np.meshgrid(axis, axis, axis, indexing='ij'), axis=-1)
+    return gaussian_basis.atom_basis('C', 3).evaluate(points)
+
+
+def payload_bytes(fig):
+    """Serialized size of a figure: the PNG of a matplotlib Figure or the Plotly JSON."""
+    if isinstance(fig, Figure):
+        import figure_cache
+        return len(figure_cache.render_png(fig))
+    return len(fig.to_json())
+
+
+def measure(run, size, repeats=7, figure=None):
+    """{'seconds', 'peak_bytes', 'payload_bytes'} of run(size), each run starting from cold caches.
+
+    `seconds` is the kernel alone; the figure is built and serialized once, after the timed runs.
+    """
+    seconds = []
+    for _ in range(repeats):
+        clear_caches()
+        start = time.perf_counter()
+        result = run(size)
+        seconds.append(time.perf_counter() - start)
+    payload = payload_bytes(result if figure is None else figure(result, size))
+    clear_caches()
+    tracemalloc.start()
+    try:
+        run(size)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return dict(seconds=min(seconds), peak_bytes=peak, payload_bytes=payload)
+
+
+def size_label(size):
+    return 'x'.join(str(n) for n in size) if isinstance(size, tuple) else str(size)
+
+
+def run_all(names, repeats=7):
+    results = {}
+    for name in names:
+        run, sizes, figure = KERNELS[name]
+        run(sizes[0])  # imports and one-time setup stay out of the timings
+        for size in sizes:
+            key = f'{name}/{size_label(size)}'
+            results[key] = measure(run, size, repeats, figure)
+            r = results[key]
+            print(f"{key:<36s} {r['seconds'] * 1e3:9.2f} ms {r['peak_bytes'] / 1e6:9.2f} MB peak "
+                  f"{r['payload_bytes'] / 1e3:10.1f} kB payload")
+    return results
+
+
+def regressions(results, baseline, time_threshold=TIME_THRESHOLD, memory_threshold=MEMORY_THRESHOLD,
+                payload_threshold=PAYLOAD_THRESHOLD):
+    """Lines describing every metric that grew past its threshold relative to the baseline."""
+    failures = []
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+        for metric, threshold, floor in (('seconds', time_threshold, MIN_SECONDS),
+                                         ('peak_bytes', memory_threshold, 0),
+                                         ('payload_bytes', payload_threshold, 0)):
+            allowed = max(reference[metric], floor) * (1 + threshold)
+            if result[metric] > allowed:
+                failures.append(f"{key}: {metric} {result[metric]:.4g} > {allowed:.4g} "
+                                f"(baseline {reference[metric]:.4g} + {threshold:.0%})")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the compute kernels against a stored baseline.")
+    parser.add_argument('kernels', nargs='*', metavar='kernel', help=f"subset of: {', '.join(KERNELS)}")
+    parser.add_argument('--baseline', default=BASELINE, help="baseline JSON file (default: %(default)s)")
+    parser.add_argument('--update', action='store_true', help="overwrite the baseline with this run")
+    parser.add_argument('--repeats', type=int, default=7)
+    parser.add_argument('--time-threshold', type=float, default=TIME_THRESHOLD,
+                        help="allowed relative slowdown (default: %(default)s)")
+    parser.add_argument('--memory-threshold', type=float, default=MEMORY_THRESHOLD,
+                        help="allowed relative growth of peak memory (default: %(default)s)")
+    parser.add_argument('--payload-threshold', type=float, default=PAYLOAD_THRESHOLD,
+                        help="allowed relative growth of the serialized payload (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    unknown = set(args.kernels) - set(KERNELS)
+    if unknown:
+        parser.error(f"unknown kernel(s): {', '.join(sorted(unknown))}")
+    results = run_all(args.kernels or list(KERNELS), args.repeats)
+
+    if args.update:
+        stored = {}
+        if args.kernels and os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                stored = json.load(f)['results']
+        stored.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(dict(machine=dict(platform=platform.platform(), python=platform.python_version(),
+                                        numpy=np.__version__),
+                           results=stored), f, indent=1, sort_keys=True)
+            f.write('\n')
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update to create one")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    missing = sorted(set(results) - set(baseline['results']))
+    if missing:
+        print(f"Not in the baseline: {', '.join(missing)}")
+    failures = regressions(results, baseline['results'], args.time_threshold, args.memory_threshold,
+                           args.payload_threshold)
+    for line in failures:
+        print(f"REGRESSION {line}")
+    print(f"{len(results) - len(failures)} of {len(results)} results within thresholds"
+          if not failures else f"{len(failures)} regression(s) against {args.baseline}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
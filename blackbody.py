@@ -0,0 +1,126 @@
+from functools import lru_cache
+
+import numpy as np
+from scipy.constants import c, h, k as k_B, physical_constants, Stefan_Boltzmann
+
+# Wien's displacement constant b = lambda_max * T and x = hc / (lambda_max k T) at the peak
+WIEN_B = physical_constants['Wien wavelength displacement law constant'][0]
+WIEN_X = h * c / (WIEN_B * k_B)
+
+# XYZ -> linear sRGB (D65 white point)
+XYZ_TO_SRGB = np.array([[3.2404542, -1.5371385, -0.4985314],
+                        [-0.9692660, 1.8760108, 0.0415560],
+                        [0.0556434, -0.2040259, 1.0572252]])
+
+# CIE 1931 2-degree matching functions as sums of piecewise Gaussians (Wyman, Sloan & Shirley 2013):
+# per function, rows of (weight, centre nm, width below centre, width above centre)
+CIE_LOBES = (
+    ((1.056, 599.8, 37.9, 31.0), (0.362, 442.0, 16.0, 26.7), (-0.065, 501.1, 20.4, 26.2)),
+    ((0.821, 568.8, 46.9, 40.5), (0.286, 530.9, 16.3, 31.1)),
+    ((1.217, 437.0, 11.8, 36.0), (0.681, 459.0, 26.0, 13.8)),
+)
+VISIBLE_NM = np.arange(360.0, 831.0)
+
+
+def planck(wavelengths, temperatures):
+    """Spectral radiance B(lambda, T) in W sr^-1 m^-3 for every temperature and wavelength.
+
+    The result has shape np.shape(temperatures) + np.shape(wavelengths). 1 / (e^x - 1) is
+    evaluated as e^-x / -expm1(-x), which underflows cleanly to 0 at short wavelengths instead
+    of overflowing, and keeps full precision in the Rayleigh-Jeans limit x -> 0.
+    """
+    wavelengths = np.asarray(wavelengths, dtype=float)
+    x = h * c / (k_B * np.multiply.outer(temperatures, wavelengths))
+    return 2 * h * c**2 / wavelengths**5 * np.exp(-x) / -np.expm1(-x)
+
+
+def wien_peak(temperatures):
+    """Wavelength (m) of maximum spectral radiance, b / T."""
+    return WIEN_B / np.asarray(temperatures, dtype=float)
+
+
+def peak_radiance(temperatures):
+    """Spectral radiance at the Wien peak, which grows as T^5."""
+    lamb = wien_peak(temperatures)
+    return 2 * h * c**2 / lamb**5 / np.expm1(WIEN_X)
+
+
+def exitance(temperatures):
+    """Total emitted power per area, sigma T^4 (W/m^2); the radiance integrated over all wavelengths is this / pi."""
+    return Stefan_Boltzmann * np.asarray(temperatures, dtype=float)**4
+
+
+def cie_matching(wavelengths_nm):
+    """x-bar, y-bar, z-bar on wavelengths in nm, shape (3, n)."""
+    lamb = np.asarray(wavelengths_nm, dtype=float)
+    rows = []
+    for lobes in CIE_LOBES:
+        total = 0
+        for weight, centre, below, above in lobes:
+            width = np.where(lamb < centre, below, above)
+            total = total + weight * np.exp(-0.5 * ((lamb - centre) / width)**2)
+        rows.append(total)
+    return np.array(rows)
+
+
+def linear_srgb(XYZ):
+    """Linear sRGB of XYZ rows (last axis), clipped at 0 where the colour lies outside the gamut."""
+    return np.clip(np.asarray(XYZ) @ XYZ_TO_SRGB.T, 0, None)
+
+
+def encode_srgb(linear):
+    """sRGB gamma encoding of linear values in [0, 1]."""
+    return np.where(linear <= 0.0031308, 12.92 * linear, 1.055 * np.abs(linear)**(1 / 2.4) - 0.055)
+
+
+def decode_srgb(encoded):
+    """Linear values of gamma-encoded sRGB in [0, 1], the inverse of encode_srgb."""
+    return np.where(encoded <= 0.04045, encoded / 12.92, ((np.abs(encoded) + 0.055) / 1.055)**2.4)
+
+
+def visible_luminance(temperatures):
+    """CIE Y (unnormalized) of the blackbody spectra on 360-830 nm, shape np.shape(temperatures)."""
+    return planck(VISIBLE_NM * 1e-9, temperatures) @ cie_matching(VISIBLE_NM)[1]
+
+
+@lru_cache(maxsize=4)
+def color_table(t_min=1000.0, t_max=40000.0, n_temperatures=2048):
+    """Read-only (temperatures, rgb) lookup table of blackbody colours, log-spaced in T.
+
+    Built once: all spectra on 360-830 nm are integrated against the matching functions in
+    a single matrix product. Colours are clipped to the sRGB gamut, scaled so their largest
+    channel is 1 (chromaticity, not brightness) and gamma encoded. Below ~1000 K almost all
+    visible light sits in the far red tail, where the analytic matching functions are poor.
+    """
+    temperatures = np.geomspace(t_min, t_max, n_temperatures)
+    XYZ = planck(VISIBLE_NM * 1e-9, temperatures) @ cie_matching(VISIBLE_NM).T
+    rgb = linear_srgb(XYZ)
+    rgb = encode_srgb(rgb / rgb.max(axis=1, keepdims=True))
+    for array in (temperatures, rgb):
+        array.flags.writeable = False
+    return temperatures, rgb
+
+
+def srgb(temperatures):
+    """sRGB colours in [0, 1] of shape np.shape(temperatures) + (3,), interpolated in log T from color_table.
+
+    Temperatures above the table take its hottest colour. Those below it keep the coolest
+    chromaticity, dimmed by their visible luminance relative to the table's end, so a body
+    at room temperature renders black instead of the orange of 1000 K.
+    """
+    temperatures = np.asarray(temperatures, dtype=float)
+    table_T, table_rgb = color_table()
+    position = np.interp(np.log(temperatures), np.log(table_T), np.arange(len(table_T)))
+    lower = np.minimum(position.astype(int), len(table_T) - 2)
+    t = (position - lower)[..., None]
+    rgb = (1 - t) * table_rgb[lower] + t * table_rgb[lower + 1]
+    cold = temperatures < table_T[0]
+    if np.any(cold):
+        dim = visible_luminance(temperatures[cold]) / visible_luminance(table_T[0])
+        rgb[cold] = encode_srgb(decode_srgb(table_rgb[0]) * dim[..., None])
+    return rgb
+
+
+def hex_colors(temperatures):
+    """'#rrggbb' strings for the temperatures, e.g. for swatches."""
+    return ['#%02x%02x%02x' % tuple(row) for row in np.rint(255 * srgb(np.ravel(temperatures))).astype(int)]
@@ -0,0 +1,130 @@
+import heapq
+import math
+from functools import lru_cache
+
+import numpy as np
+
+
+def energy(quantum_numbers, lengths, m=1.0, hbar=1.0):
+    """E = pi^2 hbar^2 / (2m) * sum(n_i^2 / L_i^2) for a box with sides `lengths`."""
+    return math.pi**2 * hbar**2 / (2 * m) * sum(n**2 / L**2 for n, L in zip(quantum_numbers, lengths))
+
+
+def iter_states(lengths, m=1.0, hbar=1.0):
+    """Yield (energy, quantum_numbers) for a 2D or 3D box in increasing energy, without end.
+
+    A heap holds the frontier. Each state has exactly one parent (decrement its last
+    coordinate above 1), so children are pushed only by incrementing coordinate i when every
+    later coordinate is still 1. Each state is therefore pushed once, and no 'seen' set is needed.
+    """
+    dims = len(lengths)
+    start = (1,) * dims
+    heap = [(energy(start, lengths, m, hbar), start)]
+    while heap:
+        E, state = heapq.heappop(heap)
+        yield E, state
+        for i in range(dims):
+            if all(n == 1 for n in state[i + 1:]):
+                child = state[:i] + (state[i] + 1,) + state[i + 1:]
+                heapq.heappush(heap, (energy(child, lengths, m, hbar), child))
+
+
+def iter_levels(lengths, m=1.0, hbar=1.0, rtol=1e-9):
+    """Yield (energy, [quantum_numbers, ...]) with degenerate states grouped together."""
+    group, group_energy = [], None
+    for E, state in iter_states(lengths, m, hbar):
+        if group and not math.isclose(E, group_energy, rel_tol=rtol):
+            yield group_energy, group
+            group = []
+        if not group:
+            group_energy = E
+        group.append(state)
+
+
+def lowest_states(count, lengths, m=1.0, hbar=1.0):
+    """Energies and quantum numbers of the `count` lowest states, as arrays sorted by energy.
+
+    Vectorized counterpart of iter_states for bulk listings: every state below an energy
+    cutoff (first guessed from Weyl's law, then raised until enough states fall below it)
+    is enumerated on a grid and sorted at once.
+    """
+    lengths = np.asarray(lengths, dtype=float)
+    dims = len(lengths)
+    prefactor = math.pi**2 * hbar**2 / (2 * m)
+    # Weyl's law: N(E) ~ volume of the positive-orthant ellipsoid sum (n_i / L_i)^2 <= E / prefactor
+    unit_ball = math.pi**(dims / 2) / math.gamma(dims / 2 + 1)
+    cutoff = prefactor * (2**dims * count / (unit_ball * np.prod(lengths)))**(2 / dims)
+    while True:
+        n_max = np.floor(lengths * math.sqrt(cutoff / prefactor)).astype(int) + 1
+        axes = [np.arange(1, k + 1) for k in n_max]
+        grids = np.meshgrid(*axes, indexing='ij')
+        energies = prefactor * sum(g**2 / L**2 for g, L in zip(grids, lengths))
+        below = energies <= cutoff
+        if np.count_nonzero(below) >= count:
+            break
+        cutoff *= 1.5
+    energies = energies[below]
+    states = np.column_stack([g[below] for g in grids])
+    order = np.argsort(energies, kind='stable')[:count]
+    return energies[order], states[order]
+
+
+def degeneracy_groups(energies, rtol=1e-9):
+    """Split sorted energies into (start, stop) index ranges of degenerate levels."""
+    if len(energies) == 0:
+        return []
+    breaks = np.flatnonzero(~np.isclose(energies[1:], energies[:-1], rtol=rtol, atol=0)) + 1
+    bounds = np.r_[0, breaks, len(energies)]
+    return [(int(start), int(stop)) for start, stop in zip(bounds[:-1], bounds[1:])]
+
+
+# Largest grid_points; a cached table for a state that needs it holds 512 x 2049 floats
+MAX_GRID_POINTS = 2049
+
+
+@lru_cache(maxsize=32)
+def _sine_table(L, n_points, n_rows):
+    x = np.linspace(0, L, n_points)
+    table = np.sqrt(2 / L) * np.sin(np.outer(np.arange(1, n_rows + 1), np.pi * x / L))
+    x.flags.writeable = False
+    table.flags.writeable = False
+    return x, table
+
+
+def grid_points(n):
+    """Points per axis that resolve sin(n pi x / L) with >= 4 per half-wave, at most MAX_GRID_POINTS.
+
+    Rounded up with sine_table's rows, so nearby states share one cached table.
+    """
+    n_rows = max(16, 1 << (int(n) - 1).bit_length())
+    return min(max(101, 4 * n_rows + 1), MAX_GRID_POINTS)
+
+
+def sine_table(n, L, n_points):
+    """Grid x and the cached 1D table sqrt(2/L) sin(k pi x / L) for k = 1 .. (at least) n.
+
+    Rows are allocated in powers of two so browsing nearby states reuses the same table.
+    """
+    n_rows = max(16, 1 << (int(n) - 1).bit_length())
+    return _sine_table(float(L), n_points, n_rows)
+
+
+def wavefunction(quantum_numbers, lengths, n_points=100):
+    """Box eigenfunction on a regular grid, as an outer product of cached 1D sine rows.
+
+    n_points is one count for every axis or one per axis. Returns (axes, psi); for 2D
+    psi[j, i] = phi_nx(x_i) phi_ny(y_j), i.e. meshgrid(x, y) order, and for 3D psi[i, j, k]
+    follows meshgrid(x, y, z, indexing='ij').
+    """
+    axes, rows = [], []
+    counts = np.broadcast_to(n_points, len(quantum_numbers))
+    for n, L, n_points in zip(quantum_numbers, lengths, counts):
+        n_points = int(n_points)
+        x, table = sine_table(n, L, n_points)
+        axes.append(x)
+        rows.append(table[n - 1])
+    if len(rows) == 2:
+        psi = np.outer(rows[1], rows[0])
+    else:
+        psi = np.einsum('i,j,k->ijk', *rows)
+    return axes, psi
@@ -1,37 +1,123 @@
+from functools import lru_cache
+
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
+import figure_cache
+import blackbody
+import diffraction
+import detection
 
 st.title('Double-Slit Experiment Model')
 
 # Choices
 wave_type = st.radio("Choose the wave type:", ('Light', 'Electron'))
-num_slits = st.slider('Number of slits', 2, 5, 2)
+num_slits = st.slider('Number of slits', 2, 10, 2)
 
-# Wave-specific parameters
+# Wave-specific parameters: a spectrum of wavelengths (m) with relative weights
 if wave_type == 'Light':
-    wavelength = st.slider('Wavelength (nm)', 380, 750, 550)  # Visible light spectrum
+    source = st.radio("Light source:", ('Monochromatic', 'Blackbody', 'White LED'))
+    if source == 'Monochromatic':
+        wavelength = st.slider('Wavelength (nm)', 380, 750, 550)  # Visible light spectrum
+        wavelengths, weights = np.array([wavelength * 1e-9]), np.ones(1)
+        spectrum_key = (wavelength,)
+    else:
+        n_samples = st.slider('Spectrum samples', 50, 5000, 2000, step=50)
+        wavelengths = np.linspace(380e-9, 780e-9, n_samples)
+        if source == 'Blackbody':
+            temperature = st.slider('Temperature (K)', 2000, 10000, 5500, step=100)
+            weights = blackbody.planck(wavelengths, temperature)
+            spectrum_key = (n_samples, temperature)
+        else:
+            weights = diffraction.led_spectrum(wavelengths)
+            spectrum_key = (n_samples,)
 elif wave_type == 'Electron':
+    source = 'Electron'
     wavelength = st.slider('Wavelength (pm)', 10.0, 50.0, 12.3, 0.1)  # Typical electron wavelength with float parameters
+    wavelengths, weights = np.array([wavelength * 1e-12]), np.ones(1)
+    spectrum_key = (wavelength,)
 
 distance_between_slits = st.slider('Distance between slits (micrometers)', 1, 100, 50)
 distance_to_screen = st.slider('Distance to screen (meters)', 1, 10, 2)
 slit_width = st.slider('Slit width (micrometers)', 10, 500, 200)
+n_points = st.slider('Screen points', 400, 4000, 2000, step=100)
 
-# Constants
-pi = np.pi
+# Electron fringes are ~10^4 times finer than optical ones, so their screen spans a few
+# single-slit envelope widths instead of a fixed 2 cm
+half_width = 0.01 if wave_type == 'Light' else 2.5 * wavelengths.max() * distance_to_screen / (slit_width * 1e-6)
+y = np.linspace(-half_width, half_width, n_points)
 
-# Calculation for multi-slit interference
-y = np.linspace(-0.01, 0.01, 400)
-beta = pi * slit_width * 1e-6 * y / (wavelength * 1e-9 * distance_to_screen)
-intensity = (np.sin(beta) / beta)**2
-for i in range(1, num_slits):
-    intensity *= (np.cos(pi * i * distance_between_slits * 1e-6 * y / (wavelength * 1e-9 * distance_to_screen)))**2
+# Spectrum x screen intensities in bounded chunks, reduced to intensity and colour. Only the
+# figures need it, so it runs when one of their PNGs is not cached, and then once per rerun
+@lru_cache(maxsize=1)
+def pattern():
+    return diffraction.polychromatic_pattern(
+        y, wavelengths, weights, num_slits, distance_between_slits * 1e-6, slit_width * 1e-6, distance_to_screen)
 
 # Plot
-fig, ax = plt.subplots()
-ax.plot(y, intensity, color='blue')
-ax.set_xlabel('Position on screen (m)')
-ax.set_ylabel('Intensity')
-st.pyplot(fig)
+def draw(page_figure):
+    intensity, XYZ = pattern()[:2]
+    if wave_type == 'Light':
+        strip = diffraction.color_strip(XYZ)
+    else:
+        strip = np.repeat(intensity[:, None] / intensity.max(), 3, axis=1)  # Detector counts in grey
+
+    artists = page_figure.artists
+    if page_figure.rebuild_needed('pattern'):
+        page_figure.fig.set_layout_engine('constrained')
+        ax, strip_ax = page_figure.fig.subplots(2, 1, height_ratios=[4, 1], sharex=True)
+        artists['ax'], artists['strip_ax'] = ax, strip_ax
+        artists['curve'], = ax.plot(y, intensity, color='blue')
+        ax.set_ylabel('Intensity')
+        artists['strip'] = strip_ax.imshow(strip[None], aspect='auto', extent=(y[0], y[-1], 0, 1))
+        strip_ax.set_yticks([])
+        strip_ax.set_xlabel('Position on screen (m)')
+    else:
+        # Update the existing artists instead of building a new figure
+        artists['curve'].set_data(y, intensity)
+        artists['strip'].set_data(strip[None])
+        artists['strip'].set_extent((y[0], y[-1], 0, 1))
+        artists['ax'].relim()
+        artists['ax'].autoscale_view()
+
+png = figure_cache.cached_png(st.session_state, 'double_slit_electron',
+                              (wave_type, source, num_slits) + spectrum_key +
+                              (distance_between_slits, distance_to_screen, slit_width, n_points), draw)
+st.image(png)
+if pattern.cache_info().currsize:
+    st.caption(f"{wavelengths.size * y.size:,} wavelength-point evaluations in {pattern()[2] * 1e3:.0f} ms")
+else:
+    st.caption(f"{wavelengths.size * y.size:,} wavelength-point evaluations, PNG reused from the cache")
+
+# Electron-by-electron buildup: the same intensity sampled as individual detector hits
+if wave_type == 'Electron' and st.checkbox('Show electron-by-electron buildup'):
+    max_power = st.slider('Electrons in the last frame (10^n)', 3, 7, 6)
+    snapshots = np.logspace(1, max_power, max_power)
+
+    def draw_buildup(page_figure):
+        artists = page_figure.artists
+        frames = detection.buildup(y, pattern()[0], snapshots, shape=(40, 400))
+        if page_figure.rebuild_needed(('buildup', max_power)):
+            page_figure.fig.set_layout_engine('constrained')
+            page_figure.fig.set_size_inches(6.4, 1.0 + 0.8 * max_power)
+            axes = page_figure.fig.subplots(len(snapshots), 1, sharex=True)
+            artists['frames'] = []
+            for ax, (hits, counts) in zip(axes, frames):
+                # Each frame scaled to its own brightest bin, so early sparse frames show single dots
+                artists['frames'].append(ax.imshow(counts, cmap='gray', aspect='auto', interpolation='nearest'))
+                ax.set_yticks([])
+                ax.set_ylabel(f'{hits:,}', rotation=0, ha='right', va='center')
+            axes[-1].set_xlabel('Position on screen (m)')
+        else:
+            # Same frame layout: refill the existing images
+            for image, (hits, counts) in zip(artists['frames'], frames):
+                image.set_data(counts)
+                image.autoscale()
+        for image in artists['frames']:
+            image.set_extent((y[0], y[-1], 0, 1))
 
+    png = figure_cache.cached_png(st.session_state, 'double_slit_buildup',
+                                  (max_power, num_slits, wavelength, distance_between_slits, distance_to_screen,
+                                   slit_width, n_points), draw_buildup)
+    st.image(png)
+    st.caption('Hits are drawn from a precomputed inverse-CDF table in vectorized batches and binned into a '
+               'fixed-size detector image, so memory does not grow with the number of electrons.')
@@ -1,6 +1,6 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
+import figure_cache
 
 st.title('Double-Slit Experiment Model')
 
@@ -19,10 +19,21 @@ beta = pi * slit_width * 1e-6 * y / (wavelength * 1e-9 * distance_to_screen)
 intensity = (np.sin(beta) / beta)**2 * (np.cos(pi * distance_between_slits * 1e-6 * y / (wavelength * 1e-9 * distance_to_screen)))**2
 
 # Plot
-fig, ax = plt.subplots()
-ax.plot(y, intensity, color='blue')
-ax.set_xlabel('Position on screen (m)')
-ax.set_ylabel('Intensity')
-st.pyplot(fig)
+def draw(page_figure):
+    artists = page_figure.artists
+    if page_figure.rebuild_needed('pattern'):
+        ax = artists['ax'] = page_figure.fig.add_subplot()
+        artists['curve'], = ax.plot(y, intensity, color='blue')
+        ax.set_xlabel('Position on screen (m)')
+        ax.set_ylabel('Intensity')
+    else:
+        # Update the existing curve instead of building a new figure
+        artists['curve'].set_data(y, intensity)
+        artists['ax'].relim()
+        artists['ax'].autoscale_view()
+
+png = figure_cache.cached_png(st.session_state, 'double_slit',
+                              (wavelength, distance_between_slits, distance_to_screen, slit_width), draw)
+st.image(png)
 
 
@@ -0,0 +1,126 @@
+import io
+import threading
+from collections import OrderedDict
+
+from matplotlib.figure import Figure
+
+import timing
+
+# Same savefig settings st.pyplot uses, so cached PNGs look identical
+SAVEFIG_KWARGS = dict(format='png', bbox_inches='tight', dpi=200)
+
+
+class PngCache:
+    """Thread-safe LRU of rendered PNG bytes, bounded by total size rather than entry count."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            png = self._entries.get(key)
+            if png is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return png
+
+    def put(self, key, png):
+        with self._lock:
+            if len(png) > self.max_bytes:
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.nbytes -= len(old)
+            self._entries[key] = png
+            self.nbytes += len(png)
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= len(evicted)
+
+
+# Shared by every session in the process
+png_cache = PngCache(64 * 2**20)
+
+
+class PageFigure:
+    """One session's figure for one page, plus the artists the page updates in place.
+
+    The figure is a bare matplotlib Figure rather than a pyplot one, so it never enters
+    pyplot's global registry and is freed with the session instead of leaking.
+    """
+
+    def __init__(self, figsize=None):
+        self.fig = Figure(figsize=figsize)
+        self.artists = {}
+        self.layout = None
+
+    def rebuild_needed(self, layout):
+        """Clear the figure when the page's structure (e.g. number of levels) changes.
+
+        Returns True when the page must create its artists; False means it can call
+        set_data on the ones stored in `artists`.
+        """
+        if layout == self.layout and self.artists:
+            return False
+        self.fig.clear()
+        self.artists.clear()  # in place: pages hold a reference taken before this call
+        self.layout = layout
+        return True
+
+    def close(self):
+        self.fig.clear()
+        self.artists.clear()
+        self.layout = None
+
+
+def session_figure(store, page, figsize=None):
+    """Return the PageFigure kept in `store` (e.g. st.session_state) for `page`."""
+    key = f'_figure_{page}'
+    page_figure = store.get(key)
+    if page_figure is None:
+        page_figure = PageFigure(figsize)
+        store[key] = page_figure
+    return page_figure
+
+
+def release_figure(store, page):
+    """Close and forget a session's figure for `page`."""
+    page_figure = store.pop(f'_figure_{page}', None)
+    if page_figure is not None:
+        page_figure.close()
+
+
+def release_figures(store):
+    """Close and forget all of a session's figures, e.g. when it leaves the page that drew them."""
+    for key in [key for key in store if key.startswith('_figure_')]:
+        release_figure(store, key[len('_figure_'):])
+
+
+def render_png(fig):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, **SAVEFIG_KWARGS)
+    return buffer.getvalue()
+
+
+def cached_png(store, page, params, draw, figsize=None):
+    """PNG for `page` at `params`, calling draw(page_figure) only on a cache miss.
+
+    `params` must be hashable and cover every input that changes the picture. Repeated
+    parameter combinations skip both drawing and rasterization.
+    """
+    key = (page,) + tuple(params)
+    png = png_cache.get(key)
+    if png is None:
+        page_figure = session_figure(store, page, figsize)
+        draw(page_figure)
+        with timing.span('rasterize'):
+            png = render_png(page_figure.fig)
+        png_cache.put(key, png)
+    return png
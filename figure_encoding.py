@@ -0,0 +1,66 @@
+import base64
+
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+# Base64 bytes of array data a surface trace may ship per rerun; the grid is thinned to fit
+SURFACE_BUDGET = 32 * 1024
+
+
+def typed_array(values, dtype='<f4'):
+    """Plotly typed-array spec {dtype, bdata, shape}: the raw little-endian bytes in base64.
+
+    plotly.js decodes it straight into a typed array, so the JSON carries 4 bytes (x 4/3 for
+    base64) per float32 value instead of a ~20-character decimal number.
+    """
+    values = np.ascontiguousarray(values, dtype=dtype)
+    spec = dict(dtype=values.dtype.str[1:], bdata=base64.b64encode(values.tobytes()).decode('ascii'))
+    if values.ndim > 1:
+        spec['shape'] = ', '.join(str(n) for n in values.shape)
+    return spec
+
+
+def lod_indices(n, n_target):
+    """About n_target evenly spread indices into range(n), always keeping both ends."""
+    if n_target >= n:
+        return np.arange(n)
+    return np.unique(np.linspace(0, n - 1, max(2, n_target)).round().astype(int))
+
+
+def level_of_detail(shape, n_arrays, budget, axes=None, min_shape=None, itemsize=4):
+    """Index arrays, one per axis, that thin n_arrays grids of `shape` to about `budget` base64 bytes.
+
+    Only `axes` (default: all) are thinned, by a common factor, and never below `min_shape`,
+    which callers set from the finest feature they must resolve; detail wins over the budget.
+    """
+    axes = range(len(shape)) if axes is None else axes
+    min_shape = (2,) * len(shape) if min_shape is None else min_shape
+    full = n_arrays * np.prod(shape) * itemsize * 4 / 3
+    scale = min(1.0, budget / full) ** (1 / len(axes))
+    return tuple(lod_indices(n, max(int(n * scale), lowest)) if axis in axes else np.arange(n)
+                 for axis, (n, lowest) in enumerate(zip(shape, min_shape)))
+
+
+def surface(z, x, y, budget=SURFACE_BUDGET, axes=None, min_shape=None, **kwargs):
+    """go.Surface with float32 typed arrays, thinned to `budget`.
+
+    x and y are either 1D axes (len(x) columns, len(y) rows of z), which is all a surface over
+    a rectangular grid needs, or 2D arrays like z for a parametric surface. `axes` and
+    `min_shape` are passed to level_of_detail.
+    """
+    z = np.asarray(z)
+    x, y = np.asarray(x), np.asarray(y)
+    parametric = x.ndim == 2
+    rows, columns = level_of_detail(z.shape, 3 if parametric else 1, budget, axes, min_shape)
+    grid = np.ix_(rows, columns)
+    if parametric:
+        x, y = x[grid], y[grid]
+    else:
+        x, y = x[columns], y[rows]
+    return go.Surface(z=typed_array(z[grid]), x=typed_array(x), y=typed_array(y), **kwargs)
+
+
+def payload_bytes(fig):
+    """Size of the JSON st.plotly_chart sends for `fig`."""
+    return len(pio.to_json(fig, validate=False))
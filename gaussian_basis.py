@@ -0,0 +1,185 @@
+import math
+
+import numpy as np
+
+# Least-squares Gaussian expansions of Slater functions with zeta = 1 (the STO-nG fits of
+# Hehre, Stewart and Pople): n_gauss -> shell -> (exponents, contraction coefficients).
+# 2s and 2p share their exponents ('2sp'); exponents scale with zeta^2.
+STO_NG = {
+    1: {'1s': ((0.2709498060,),
+               (1.0,)),
+        '2sp': ((0.1366833544,),
+                (1.0,),
+                (1.0,))},
+    2: {'1s': ((0.8518186477, 0.1516232925),
+               (0.4301285012, 0.6789135262)),
+        '2sp': ((0.3842640821, 0.0974577326),
+                (0.0494477957, 0.9638005253),
+                (0.5115175008, 0.6128447343))},
+    3: {'1s': ((2.2276605970, 0.4057711562, 0.1098175104),
+               (0.1543289673, 0.5353281423, 0.4446345422)),
+        '2sp': ((0.9941927999, 0.2310310213, 0.0751386596),
+                (-0.0999672292, 0.3995128261, 0.7001154689),
+                (0.1559162750, 0.6076837186, 0.3919573931))},
+    4: {'1s': ((5.2168441138, 0.9546185091, 0.2652034578, 0.0880186352),
+               (0.0567524114, 0.2601412815, 0.5328461368, 0.2916254991)),
+        '2sp': ((2.3235008181, 0.5029885698, 0.1635407064, 0.0628104622),
+                (-0.0622071881, 0.0000298492, 0.5588546159, 0.4977675918),
+                (0.0436844030, 0.2863793329, 0.5835751448, 0.2463136109))},
+    5: {'1s': ((11.3056321514, 2.0717271047, 0.5786481995, 0.1975723555, 0.0744526867),
+               (0.0221405675, 0.1135412142, 0.3318162908, 0.4825700540, 0.1935719960)),
+        '2sp': ((5.0362943928, 1.0325035361, 0.3290599141, 0.1279200160, 0.0544948486),
+                (-0.0294085524, -0.0653274565, 0.1289972059, 0.6122902416, 0.3461204243),
+                (0.0125560950, 0.1075576567, 0.3735974637, 0.5102397514, 0.1568281046))},
+    6: {'1s': ((23.10303149, 4.235915534, 1.185056519, 0.4070988982, 0.1580884151, 0.06510953954),
+               (0.009163596281, 0.04936149294, 0.1685383049, 0.3705627997, 0.4164915298, 0.1303340841)),
+        '2sp': ((10.30869372, 2.040359519, 0.6341422177, 0.2439773685, 0.1059595374, 0.04856900860),
+                (-0.01325278809, -0.04699171014, -0.03378537151, 0.2502417861, 0.5951172526, 0.2407061763),
+                (0.003759696623, 0.03767936984, 0.1738967435, 0.4180364347, 0.4258595477, 0.1017082955))},
+}
+
+# Standard molecular Slater exponents of the minimal basis (1s, 2sp) for H-Ne
+ZETA = {
+    'H': (1.24,), 'He': (1.69,),
+    'Li': (2.69, 0.80), 'Be': (3.68, 1.15), 'B': (4.68, 1.50), 'C': (5.67, 1.72),
+    'N': (6.67, 1.95), 'O': (7.66, 2.25), 'F': (8.65, 2.55), 'Ne': (9.64, 2.88),
+}
+
+# Cartesian powers (lx, ly, lz) of the minimal-basis functions
+SHELL_POWERS = {'1s': (0, 0, 0), '2s': (0, 0, 0), '2px': (1, 0, 0), '2py': (0, 1, 0), '2pz': (0, 0, 1)}
+
+
+def _double_factorial(n):
+    """(n)!! with (-1)!! = 0!! = 1."""
+    return math.prod(range(n, 0, -2)) if n > 0 else 1
+
+
+def primitive_norm(alpha, powers):
+    """Normalization of x^lx y^ly z^lz exp(-alpha r^2)."""
+    L = sum(powers)
+    odd = math.prod(_double_factorial(2 * l - 1) for l in powers)
+    return (2 * alpha / math.pi)**0.75 * math.sqrt((4 * alpha)**L / odd)
+
+
+def sto_ng(shell, n_gauss, zeta=1.0):
+    """(exponents, coefficients) of the STO-nG expansion of a 1s, 2s or 2p Slater function."""
+    if shell == '1s':
+        exponents, coefficients = STO_NG[n_gauss]['1s']
+    else:
+        exponents, coefficients_s, coefficients_p = STO_NG[n_gauss]['2sp']
+        coefficients = coefficients_s if shell == '2s' else coefficients_p
+    return np.array(exponents) * zeta**2, np.array(coefficients)
+
+
+class ContractedBasis:
+    """Contracted Cartesian Gaussians stored as padded (n_functions, max_primitives) arrays.
+
+    `coefficients` already include the primitive normalizations and the renormalization of
+    the whole contraction (both analytic), so function k is
+        (x - X_k)^lx (y - Y_k)^ly (z - Z_k)^lz sum_p coefficients[k, p] exp(-exponents[k, p] r_k^2)
+    and padding entries have zero coefficients.
+    """
+
+    def __init__(self, exponents, coefficients, centers, powers, labels=None):
+        n_functions = len(exponents)
+        width = max(len(e) for e in exponents)
+        self.exponents = np.zeros((n_functions, width))
+        self.contraction = np.zeros((n_functions, width))
+        for k, (e, d) in enumerate(zip(exponents, coefficients)):
+            self.exponents[k, :len(e)] = e
+            self.contraction[k, :len(d)] = d
+        self.centers = np.asarray(centers, dtype=float).reshape(n_functions, 3)
+        self.powers = np.asarray(powers, dtype=int).reshape(n_functions, 3)
+        self.labels = list(labels) if labels is not None else [str(k) for k in range(n_functions)]
+
+        self.coefficients = np.zeros_like(self.contraction)
+        for k in range(n_functions):
+            powers_k = tuple(self.powers[k])
+            used = self.contraction[k] != 0
+            alpha = self.exponents[k, used]
+            c = self.contraction[k, used] * np.array([primitive_norm(a, powers_k) for a in alpha])
+            # Same-centre primitive overlaps: (pi/p)^(3/2) prod (2l-1)!! / (2p)^L
+            p = np.add.outer(alpha, alpha)
+            odd = math.prod(_double_factorial(2 * l - 1) for l in powers_k)
+            overlap = (np.pi / p)**1.5 * odd / (2 * p)**sum(powers_k)
+            self.coefficients[k, used] = c / math.sqrt(c @ overlap @ c)
+
+        # Functions grouped by centre; each group evaluates exp(-alpha r^2) once per distinct exponent
+        self._groups = []
+        unique_centers, center_index = np.unique(self.centers, axis=0, return_inverse=True)
+        for i, center in enumerate(unique_centers):
+            rows = np.flatnonzero(center_index.ravel() == i)
+            used = self.coefficients[rows] != 0
+            alphas, inverse = np.unique(self.exponents[rows][used], return_inverse=True)
+            mixing = np.zeros((rows.size, alphas.size))
+            np.add.at(mixing, (np.nonzero(used)[0], inverse.ravel()), self.coefficients[rows][used])
+            self._groups.append((center, rows, alphas, mixing))
+
+    def __len__(self):
+        return len(self.exponents)
+
+    @classmethod
+    def concatenate(cls, bases):
+        """One basis holding the functions of all `bases` in order."""
+        exponents, coefficients = [], []
+        for basis in bases:
+            for e, d in zip(basis.exponents, basis.contraction):
+                used = d != 0
+                exponents.append(e[used])
+                coefficients.append(d[used])
+        return cls(exponents, coefficients,
+                   np.concatenate([b.centers for b in bases]),
+                   np.concatenate([b.powers for b in bases]),
+                   [label for b in bases for label in b.labels])
+
+    def evaluate(self, points, dtype=np.float64):
+        """All functions on points of shape (..., 3) as an array of shape (n_functions, ...).
+
+        Per centre, the distinct exponentials form one (n_exponents, n_points) array and the
+        contraction is a single matrix product; dtype=np.float32 halves memory and time on
+        dense grids at ~1e-7 relative accuracy.
+        """
+        points = np.asarray(points)
+        grid_shape = points.shape[:-1]
+        points = points.reshape(-1, 3).astype(dtype, copy=False)
+        values = np.empty((len(self), points.shape[0]), dtype=dtype)
+        for center, rows, alphas, mixing in self._groups:
+            diff = points - center.astype(dtype)
+            r2 = np.einsum('ij,ij->i', diff, diff)
+            block = mixing.astype(dtype) @ np.exp(-np.outer(alphas.astype(dtype), r2))
+            for axis in range(3):
+                for row in np.flatnonzero(self.powers[rows, axis]):
+                    block[row] *= diff[:, axis]**self.powers[rows[row], axis]
+            values[rows] = block
+        return values.reshape((len(self),) + grid_shape)
+
+
+def atom_basis(symbol, n_gauss=3, center=(0.0, 0.0, 0.0)):
+    """Minimal STO-nG basis of an H-Ne atom: 1s, plus 2s and 2p for Li-Ne."""
+    zetas = ZETA[symbol]
+    shells = ['1s'] if len(zetas) == 1 else ['1s', '2s', '2px', '2py', '2pz']
+    exponents, coefficients = [], []
+    for shell in shells:
+        zeta = zetas[0] if shell == '1s' else zetas[1]
+        e, d = sto_ng(shell[:2], n_gauss, zeta)
+        exponents.append(e)
+        coefficients.append(d)
+    return ContractedBasis(exponents, coefficients, [center] * len(shells),
+                           [SHELL_POWERS[s] for s in shells], [f"{symbol} {s}" for s in shells])
+
+
+def molecule_basis(atoms, n_gauss=3):
+    """Minimal STO-nG basis for atoms given as [(symbol, (x, y, z)), ...]."""
+    return ContractedBasis.concatenate([atom_basis(symbol, n_gauss, center) for symbol, center in atoms])
+
+
+def slater_orbital(points, zeta, shell='1s', center=(0.0, 0.0, 0.0)):
+    """Normalized real Slater function ('1s', '2s', '2px', '2py' or '2pz') on points of shape (..., 3)."""
+    diff = np.asarray(points, dtype=float) - np.asarray(center, dtype=float)
+    r = np.sqrt(np.sum(diff**2, axis=-1))
+    n = int(shell[0])
+    radial = (2 * zeta)**(n + 0.5) / math.sqrt(math.factorial(2 * n)) * np.exp(-zeta * r)
+    if shell[1] == 's':
+        return radial * r**(n - 1) / math.sqrt(4 * math.pi)
+    axis = 'xyz'.index(shell[2])
+    return radial * r**(n - 2) * diff[..., axis] * math.sqrt(3 / (4 * math.pi))
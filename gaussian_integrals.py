@@ -0,0 +1,75 @@
+import numpy as np
+from scipy.special import erf
+
+
+def boys0(t):
+    """Boys function F0(t) = int_0^1 exp(-t u^2) du, elementwise; a Taylor series near t = 0."""
+    t = np.asarray(t, dtype=float)
+    small = t < 1e-8
+    root = np.sqrt(np.where(small, 1.0, t))
+    return np.where(small, 1 - t / 3, 0.5 * np.sqrt(np.pi) * erf(root) / root)
+
+
+def primitives(basis, centers=None):
+    """Flattened primitives of an s-type ContractedBasis.
+
+    Returns exponents (P,), centers (P, 3) and the (n_functions, P) contraction matrix D, so a
+    contracted integral is D @ primitive integrals @ D.T (one index of D per function index).
+    `centers` (n_functions, 3) replaces the basis centres, so a geometry scan reuses one basis.
+    """
+    if np.any(basis.powers):
+        raise ValueError("only s-type functions are supported")
+    centers = basis.centers if centers is None else np.asarray(centers, dtype=float)
+    owner, column = np.nonzero(basis.coefficients)
+    D = np.zeros((len(basis), owner.size))
+    D[owner, np.arange(owner.size)] = basis.coefficients[owner, column]
+    return basis.exponents[owner, column], centers[owner], D
+
+
+def _pairs(exponents, centers):
+    """Gaussian product quantities for every primitive pair: p, P, mu, exp(-mu R_AB^2) and R_AB^2."""
+    p = np.add.outer(exponents, exponents)
+    P = (exponents[:, None, None] * centers[:, None] + exponents[None, :, None] * centers[None, :]) / p[..., None]
+    R2 = np.sum((centers[:, None] - centers[None, :])**2, axis=-1)
+    mu = np.multiply.outer(exponents, exponents) / p
+    return p, P, mu, np.exp(-mu * R2), R2
+
+
+def one_electron(basis, nuclei, charges, centers=None):
+    """Contracted overlap S, kinetic T and nuclear attraction V for point charges at `nuclei`."""
+    exponents, centers, D = primitives(basis, centers)
+    p, P, mu, K, R2 = _pairs(exponents, centers)
+    S = (np.pi / p)**1.5 * K
+    T = mu * (3 - 2 * mu * R2) * S
+    # All nuclei at once: |P - C|^2 has shape (P, P, n_nuclei)
+    PC2 = np.sum((P[:, :, None] - np.asarray(nuclei, dtype=float))**2, axis=-1)
+    V = -2 * np.pi / p * K * (boys0(p[..., None] * PC2) @ np.asarray(charges, dtype=float))
+    return tuple(D @ M @ D.T for M in (S, T, V))
+
+
+def two_electron(basis, centers=None):
+    """Contracted electron-repulsion integrals (ab|cd) in chemists' notation, shape (n,) * 4.
+
+    Every primitive quartet is formed in one broadcast,
+        (ab|cd) = 2 pi^(5/2) / (p q sqrt(p + q)) K_ab K_cd F0(p q / (p + q) |P - Q|^2),
+    and contracted one index at a time.
+    """
+    exponents, centers, D = primitives(basis, centers)
+    p, P, mu, K, R2 = _pairs(exponents, centers)
+    pq = p[:, :, None, None] * p[None, None]
+    total = p[:, :, None, None] + p[None, None]
+    PQ2 = np.sum((P[:, :, None, None] - P[None, None])**2, axis=-1)
+    eri = 2 * np.pi**2.5 / (pq * np.sqrt(total)) * K[:, :, None, None] * K[None, None] * boys0(pq / total * PQ2)
+    # Each pass contracts the leading primitive index and appends the function index
+    for _ in range(4):
+        eri = np.tensordot(eri, D, axes=([0], [1]))
+    return eri
+
+
+def nuclear_repulsion(nuclei, charges):
+    """Sum over nucleus pairs of Z_A Z_B / R_AB."""
+    nuclei = np.asarray(nuclei, dtype=float)
+    charges = np.asarray(charges, dtype=float)
+    R = np.sqrt(np.sum((nuclei[:, None] - nuclei[None, :])**2, axis=-1))
+    i, j = np.triu_indices(len(charges), 1)
+    return float(np.sum(charges[i] * charges[j] / R[i, j]))
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from functools import lru_cache
+
+import numpy as np
+
+# Bump when the density formula or file layout changes so old stacks are rebuilt
+STACK_VERSION = 1
+PHASES = ('In-Phase', 'Out-of-Phase')
+MAX_STACKS = 4
+# Grids a stack is built for; other resolutions are computed directly, so a resolution
+# slider cannot build (and evict) a new multi-hundred-MB stack at every position
+STACK_RESOLUTIONS = (40, 60, 80)
+CACHE_DIR = os.environ.get('QM_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'qm_apps_cache'))
+
+a0 = 1.0  # Bohr radius in arbitrary units
+
+# One lock per stack, so building one grid does not block sessions reading another
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def psi_1s(r):
+    """Calculate the wavefunction of 1s orbital."""
+    return (np.pi**-0.5) * np.exp(-r/a0)
+
+
+class DensityStack:
+    """Memory-mapped densities for every quantized separation and both phases.
+
+    `data` has shape (len(PHASES), len(r_values), n, n, n) and is indexed like
+    meshgrid(x, y, z, indexing='ij'), so a slider move is a slice, not a recomputation.
+    """
+
+    def __init__(self, path, meta):
+        self.path = path
+        self.data = np.load(path, mmap_mode='r')
+        self.r_values = np.array(meta['r_values'])
+        self.axis = np.linspace(-meta['extent'], meta['extent'], meta['resolution'])
+        self.build_seconds = meta['build_seconds']
+        self.nbytes = meta['nbytes']
+
+    def density(self, R, phase, interpolate=True):
+        """Density at separation R, linearly interpolated between neighbouring stack entries."""
+        p = PHASES.index(phase)
+        R = min(max(R, self.r_values[0]), self.r_values[-1])
+        i = int(np.searchsorted(self.r_values, R, side='right')) - 1
+        i = min(i, len(self.r_values) - 2)
+        t = (R - self.r_values[i]) / (self.r_values[i + 1] - self.r_values[i])
+        # Copy out of the read-only map; consumers such as marching cubes need writable buffers
+        if not interpolate:
+            return np.array(self.data[p, i + int(round(t))])
+        if t == 0:
+            return np.array(self.data[p, i])
+        return (1 - t) * self.data[p, i] + t * self.data[p, i + 1]
+
+
+def _densities(axis, R):
+    """Both phase densities for one separation, computed like plot_3d_psi."""
+    X, Y, Z = np.meshgrid(axis, axis, axis, indexing='ij', sparse=True)
+    rho_perp2 = Y**2 + Z**2
+    rho1 = psi_1s(np.sqrt((X + R/2)**2 + rho_perp2))**2  # Hydrogen 1
+    rho2 = psi_1s(np.sqrt((X - R/2)**2 + rho_perp2))**2  # Hydrogen 2
+    return rho1 + rho2, np.abs(rho1 - rho2)
+
+
+def _stack_key(resolution, extent, r_values):
+    params = dict(version=STACK_VERSION, resolution=resolution, extent=extent,
+                  r_values=[round(float(r), 10) for r in r_values])
+    return hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def build_stack(resolution, extent=5.0, r_min=0.1, r_max=5.0, r_step=0.1, cache_dir=CACHE_DIR):
+    """Write the density stack for these grid parameters to disk and return its path.
+
+    The file name is a hash of the grid parameters, so changing any of them invalidates the
+    old stack; only the MAX_STACKS most recent ones are kept on disk.
+    """
+    r_values = np.round(np.arange(r_min, r_max + r_step / 2, r_step), 10)
+    key = _stack_key(resolution, extent, r_values)
+    path = os.path.join(cache_dir, f'h2_density_{key}.npy')
+    meta_path = path[:-4] + '.json'
+    if os.path.exists(path) and os.path.exists(meta_path):
+        return path
+
+    os.makedirs(cache_dir, exist_ok=True)
+    start = time.perf_counter()
+    axis = np.linspace(-extent, extent, resolution)
+    tmp_path = f'{path}.{os.getpid()}.tmp.npy'
+    data = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=np.float32,
+                                     shape=(len(PHASES), len(r_values)) + (resolution,) * 3)
+    for i, R in enumerate(r_values):
+        data[0, i], data[1, i] = _densities(axis, R)
+    data.flush()
+    del data
+    os.replace(tmp_path, path)
+
+    meta = dict(resolution=resolution, extent=extent, r_values=r_values.tolist(),
+                build_seconds=time.perf_counter() - start, nbytes=os.path.getsize(path))
+    with open(meta_path + '.tmp', 'w') as f:
+        json.dump(meta, f)
+    os.replace(meta_path + '.tmp', meta_path)
+
+    _evict(cache_dir, keep=MAX_STACKS)
+    return path
+
+
+def _evict(cache_dir, keep):
+    """Delete all but the `keep` most recently built stacks."""
+    stacks = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir)
+              if name.startswith('h2_density_') and name.endswith('.json')]
+    stacks.sort(key=os.path.getmtime, reverse=True)
+    for meta_path in stacks[keep:]:
+        for stale in (meta_path, meta_path[:-5] + '.npy'):
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+
+@lru_cache(maxsize=4)
+def _load(path):
+    with open(path[:-4] + '.json') as f:
+        meta = json.load(f)
+    return DensityStack(path, meta)
+
+
+def get_stack(resolution, extent=5.0, r_min=0.1, r_max=5.0, r_step=0.1):
+    """Return the DensityStack for these grid parameters, building it on first use."""
+    with _locks_guard:
+        lock = _locks.setdefault((resolution, extent, r_min, r_max, r_step), threading.Lock())
+    with lock:
+        path = build_stack(resolution, extent, r_min, r_max, r_step)
+        return _load(path)
+
+
+if __name__ == "__main__":
+    # Prebuild the stacks, e.g. at container start
+    for resolution in STACK_RESOLUTIONS:
+        stack = get_stack(resolution)
+        print(f"{stack.path}: {stack.nbytes / 1e6:.1f} MB built in {stack.build_seconds:.2f} s")
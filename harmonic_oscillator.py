@@ -1,7 +1,8 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.special import hermite
+import figure_cache
+import oscillator_engine
+import schrodinger_1d
 
 
 def main():
@@ -10,7 +11,7 @@ def main():
     st.title("Quantum Harmonic Oscillator Visualization")
     m = st.sidebar.number_input("Mass of the particle (m)", value=1.0, step=0.1)
     omega = st.sidebar.number_input("Angular frequency (ω)", value=1.0, step=0.1)
-    n_levels = st.sidebar.slider("Number of energy levels", 1, 10, 5)
+    n_levels = st.sidebar.slider("Number of energy levels", 1, 200, 5)
     hbar = 1
     # Quantum harmonic oscillator potential function
     def potential(x):
@@ -20,34 +21,52 @@ def main():
     def energy_level(n):
         return (n + 0.5) * hbar * omega
     
-    # Wavefunction
-    def wavefunction(n, x):
-        prefactor = (m * omega / (np.pi * hbar))**(1/4) / np.sqrt(2**n * np.math.factorial(n))
-        hermite_poly = hermite(n)
-        return prefactor * hermite_poly((m * omega / hbar)**0.5 * x) * np.exp(-m * omega * x**2 / (2 * hbar))
-    
-    # Preparing the plot
-    x = np.linspace(-5, 5, 1000)  # Range of x values
-    plt.figure(figsize=(12, 8))
-    
-    # Plotting the potential
-    plt.plot(x, potential(x), label="Potential", color='black')
-    plt.title("Potential and Wavefunctions for a Quantum Harmonic Oscillator")
-    plt.xlabel("Position (x)")
-    plt.ylabel("Energy / Amplitude")
-    
-    # Plotting the energy levels and wavefunctions
-    for n in range(n_levels):
-        energy_n = energy_level(n)
-        plt.hlines(energy_n, x[0], x[-1], colors='grey', linestyles='--', label=f"Energy level {n}" if n == 0 else "")
-        plt.plot(x, wavefunction(n, x) + energy_n, label=f"Wavefunction n={n}")
-    
-    plt.ylim(0, energy_level(n_levels) + 1)
-    plt.legend()
-    plt.grid(True)
-    
-    # Display the plot in the Streamlit app
-    st.pyplot(plt)
+    def draw(page_figure):
+        # All wavefunctions at once from the shared, cached oscillator engine
+        x, psi = oscillator_engine.eigenstates(m, omega, n_levels, -5.0, 5.0, 1000, hbar)  # Range of x values
+        energies = oscillator_engine.energy_levels(n_levels, omega, hbar)
+        artists = page_figure.artists
+
+        if page_figure.rebuild_needed(n_levels):
+            # Preparing the plot
+            ax = artists['ax'] = page_figure.fig.add_subplot()
+
+            # Plotting the potential
+            artists['potential'], = ax.plot(x, potential(x), label="Potential", color='black')
+            ax.set_title("Potential and Wavefunctions for a Quantum Harmonic Oscillator")
+            ax.set_xlabel("Position (x)")
+            ax.set_ylabel("Energy / Amplitude")
+
+            # Plotting the energy levels and wavefunctions
+            artists['levels'] = ax.hlines(energies, x[0], x[-1], colors='grey', linestyles='--', label="Energy levels")
+            artists['waves'] = [ax.plot(x, psi[n] + energies[n], label=f"Wavefunction n={n}")[0]
+                                for n in range(n_levels)]
+            if n_levels <= 10:
+                ax.legend()
+            ax.grid(True)
+        else:
+            # Same number of levels: move the existing artists instead of redrawing
+            artists['potential'].set_data(x, potential(x))
+            artists['levels'].set_segments([[(x[0], e), (x[-1], e)] for e in energies])
+            for n, line in enumerate(artists['waves']):
+                line.set_data(x, psi[n] + energies[n])
+
+        artists['ax'].set_ylim(0, energy_level(n_levels) + 1)
+
+    # Display the plot in the Streamlit app, reusing the PNG for repeated parameters
+    png = figure_cache.cached_png(st.session_state, 'harmonic_oscillator', (m, omega, n_levels), draw,
+                                  figsize=(12, 8))
+    st.image(png)
+
+    # Cross-check the analytic states against the shared finite-difference solver
+    if st.sidebar.checkbox("Validate against the numerical solver"):
+        n_check = min(n_levels, 20)
+        x, psi = oscillator_engine.eigenstates(m, omega, n_levels, -5.0, 5.0, 1000, hbar)
+        width = np.sqrt(hbar / (m * omega)) * (np.sqrt(2 * n_check + 1) + 6)
+        solution = schrodinger_1d.solve(potential, -width, width, n_check, 4001, m, hbar)
+        dE, dpsi = schrodinger_1d.compare(x, oscillator_engine.energy_levels(n_check, omega, hbar),
+                                          psi[:n_check], solution)
+        st.sidebar.caption(f"Lowest {n_check} levels: max |ΔE/E| = {dE:.1e}, max |Δψ| = {dpsi:.1e}")
     
 
 if __name__ == "__main__":
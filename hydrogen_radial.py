@@ -0,0 +1,78 @@
+import math
+from functools import lru_cache
+
+import numpy as np
+
+
+def pairs(n_max):
+    """All (n, l) with 1 <= n <= n_max and 0 <= l < n, in the row order of radial_functions."""
+    return [(n, l) for n in range(1, n_max + 1) for l in range(n)]
+
+
+def index(n, l):
+    """Row of (n, l) in the stacked arrays."""
+    return n * (n - 1) // 2 + l
+
+
+def radial_functions(n_max, r, Z=1.0, a0=1.0):
+    """R_nl(r) for every (n, l) with n <= n_max as one (n_max(n_max+1)/2, len(r)) array.
+
+    The associated Laguerre polynomials L_{n-l-1}^{(2l+1)}(rho) of all rows are advanced
+    together with the three-term recurrence, and the normalization
+        sqrt((2Z/(n a0))^3 (n-l-1)! / (2n (n+l)!)) rho^l exp(-rho/2)
+    is evaluated in log space with lgamma, so nothing overflows for large n.
+    """
+    r = np.asarray(r, dtype=float)
+    n, l = np.array(pairs(n_max)).T
+    alpha = (2 * l + 1)[:, None]
+    degree = n - l - 1
+    rho = 2 * Z * r[None, :] / (n[:, None] * a0)
+
+    log_norm = np.array([
+        1.5 * math.log(2 * Z / (ni * a0))
+        + 0.5 * (math.lgamma(ni - li) - math.log(2 * ni) - math.lgamma(ni + li + 1))
+        for ni, li in zip(n, l)
+    ])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # rho^l with 0^0 = 1 at the origin
+        log_envelope = np.where(l[:, None] == 0, 0.0, l[:, None] * np.log(rho)) - rho / 2
+
+    # Sort rows by decreasing degree so the rows still being advanced are always a prefix
+    order = np.argsort(-degree, kind='stable')
+    degree, alpha, rho = degree[order], alpha[order], rho[order]
+    laguerre = np.ones_like(rho)
+    prev = np.zeros_like(rho)
+    result = np.ones_like(rho)
+    for k in range(1, degree[0] + 1):
+        active = np.count_nonzero(degree >= k)
+        a, x = alpha[:active], rho[:active]
+        # L_k = ((2k - 1 + alpha - rho) L_{k-1} - (k - 1 + alpha) L_{k-2}) / k
+        prev, laguerre = laguerre[:active], ((2 * k - 1 + a - x) * laguerre[:active] - (k - 1 + a) * prev[:active]) / k
+        result[:active] = laguerre
+
+    unsorted = np.empty_like(result)
+    unsorted[order] = result
+    return unsorted * np.exp(log_norm[:, None] + log_envelope)
+
+
+def radial_probability(R, r):
+    """Radial probability densities P_nl(r) = r^2 R_nl(r)^2, one row per (n, l)."""
+    return np.asarray(r)**2 * R**2
+
+
+def cumulative_probability(P, r):
+    """Cumulative distributions of the rows of P (trapezoidal rule), starting at 0."""
+    steps = 0.5 * (P[:, 1:] + P[:, :-1]) * np.diff(r)
+    return np.concatenate([np.zeros((P.shape[0], 1)), np.cumsum(steps, axis=1)], axis=1)
+
+
+@lru_cache(maxsize=8)
+def atlas(n_max, r_max, n_points=1000, Z=1.0, a0=1.0):
+    """Cached (r, R, P, C) for every (n, l) up to n_max on np.linspace(0, r_max, n_points)."""
+    r = np.linspace(0, r_max, n_points)
+    R = radial_functions(n_max, r, Z, a0)
+    P = radial_probability(R, r)
+    C = cumulative_probability(P, r)
+    for array in (r, R, P, C):
+        array.flags.writeable = False
+    return r, R, P, C
@@ -0,0 +1,50 @@
+import numpy as np
+import plotly.graph_objects as go
+from skimage.measure import marching_cubes
+
+
+def extract_mesh(values, x, y, z, level, step_size=1):
+    """Run marching cubes on a 3D grid and return float32 vertices and int32 faces.
+
+    `values` must be indexed as values[i, j, k] <-> (x[i], y[j], z[k]) (meshgrid indexing='ij').
+    `step_size` > 1 skips voxels, trading surface detail for a smaller payload without
+    touching the grid resolution. Returns empty arrays when the level is not crossed.
+    """
+    if not values.min() < level < values.max():
+        return np.empty((0, 3), dtype=np.float32), np.empty((0, 3), dtype=np.int32)
+    spacing = (x[1] - x[0], y[1] - y[0], z[1] - z[0])
+    verts, faces, _, _ = marching_cubes(values, level, spacing=spacing, step_size=step_size)
+    verts += np.array([x[0], y[0], z[0]])
+    return verts.astype(np.float32), faces.astype(np.int32)
+
+
+def mesh_figure(values, x, y, z, levels, step_size=1, colorscale='Blues', opacity=0.6):
+    """Build one go.Mesh3d holding the isosurfaces of `values` at each of `levels`.
+
+    Every surface is concatenated into a single trace and coloured by its level, so the
+    browser receives only the triangles instead of the full volume.
+    """
+    all_verts, all_faces, intensity = [], [], []
+    offset = 0
+    for level in levels:
+        verts, faces = extract_mesh(values, x, y, z, level, step_size)
+        all_verts.append(verts)
+        all_faces.append(faces + offset)
+        intensity.append(np.full(len(verts), level, dtype=np.float32))
+        offset += len(verts)
+
+    verts = np.concatenate(all_verts)
+    faces = np.concatenate(all_faces)
+    fig = go.Figure(data=go.Mesh3d(
+        x=verts[:, 0],
+        y=verts[:, 1],
+        z=verts[:, 2],
+        i=faces[:, 0],
+        j=faces[:, 1],
+        k=faces[:, 2],
+        intensity=np.concatenate(intensity),
+        colorscale=colorscale,
+        opacity=opacity,
+        flatshading=False,
+    ))
+    return fig
@@ -1,108 +1,88 @@
 ## Merging all apps in one code
+import importlib
+import time
+import uuid
+
 import streamlit as st
-import numpy as np
-import matplotlib.pyplot as plt
-from scipy.special import hermite, sph_harm
-from scipy.constants import hbar, pi
-import plotly.graph_objects as go
-import math
-
-# Define the individual app functions
+
+import timing
+
+# Registry of simulations: title -> (page function, heavy modules the page imports).
+# Heavy modules are imported on first selection of a page rather than at startup.
+SIMULATIONS = {}
+
+
+def simulation(title, requires=()):
+    """Register a page function under `title`, declaring the heavy modules it needs."""
+    def register(page):
+        SIMULATIONS[title] = (page, requires)
+        return page
+    return register
+
+
+def load_requirements(title):
+    """Import a page's declared modules on first selection and return the seconds it took.
+
+    The seconds are kept in timing.import_seconds: Streamlit re-executes this script on every
+    rerun, so a dict here would be reset and report the ~0 ms of an already imported page.
+    """
+    if title not in timing.import_seconds:
+        start = time.perf_counter()
+        for name in SIMULATIONS[title][1]:
+            importlib.import_module(name)
+        timing.import_seconds[title] = time.perf_counter() - start
+    return timing.import_seconds[title]
+
+
+def show_plotly(fig):
+    """st.plotly_chart, timed as the page's plotly_json phase and counted in plotly_bytes."""
+    import figure_encoding
+
+    with timing.span('plotly_json'):
+        st.plotly_chart(fig, use_container_width=True)
+    timing.count('plotly_bytes', figure_encoding.payload_bytes(fig))
+
+
+# Define the individual app functions: widgets here, numerics and figures in simulations
+@simulation('Harmonic Oscillator', requires=('figure_cache', 'simulations', 'oscillator_engine', 'schrodinger_1d'))
 def harmonic_oscillator():
     # [Paste the Harmonic Oscillator code here, excluding imports and main()]
+    import figure_cache
+    import simulations
 
     # Streamlit interface for user inputs
     st.title("Quantum Harmonic Oscillator Visualization")
     m = st.sidebar.number_input("Mass of the particle (m)", value=1.0, step=0.1)
     omega = st.sidebar.number_input("Angular frequency (ω)", value=1.0, step=0.1)
-    n_levels = st.sidebar.slider("Number of energy levels", 1, 10, 5)
-    hbar = 1
-    # Quantum harmonic oscillator potential function
-    def potential(x):
-        return 0.5 * m * omega**2 * x**2
-    
-    # Energy level function
-    def energy_level(n):
-        return (n + 0.5) * hbar * omega
-    
-    # Wavefunction
-    def wavefunction(n, x):
-        prefactor = (m * omega / (np.pi * hbar))**(1/4) / np.sqrt(2**n * math.factorial(n))
-        hermite_poly = hermite(n)
-        return prefactor * hermite_poly((m * omega / hbar)**0.5 * x) * np.exp(-m * omega * x**2 / (2 * hbar))
-    
-    # Preparing the plot
-    x = np.linspace(-5, 5, 1000)  # Range of x values
-    plt.figure(figsize=(12, 8))
-    
-    # Plotting the potential
-    plt.plot(x, potential(x), label="Potential", color='black')
-    plt.title("Potential and Wavefunctions for a Quantum Harmonic Oscillator")
-    plt.xlabel("Position (x)")
-    plt.ylabel("Energy / Amplitude")
-    
-    # Plotting the energy levels and wavefunctions
-    for n in range(n_levels):
-        energy_n = energy_level(n)
-        plt.hlines(energy_n, x[0], x[-1], colors='grey', linestyles='--', label=f"Energy level {n}" if n == 0 else "")
-        plt.plot(x, wavefunction(n, x) + energy_n, label=f"Wavefunction n={n}")
-    
-    plt.ylim(0, energy_level(n_levels) + 1)
-    plt.legend()
-    plt.grid(True)
-    
-    # Display the plot in the Streamlit app
-    st.pyplot(plt)
-    
+    n_levels = st.sidebar.slider("Number of energy levels", 1, 200, 5)
+
+    def draw(page_figure):
+        with timing.span('compute'):
+            data = simulations.harmonic_oscillator(m, omega, n_levels)
+        with timing.span('figure'):
+            simulations.draw_harmonic_oscillator(data, page_figure)
 
+    # Display the plot in the Streamlit app, reusing the PNG for repeated parameters
+    png = figure_cache.cached_png(st.session_state, 'harmonic_oscillator', (m, omega, n_levels), draw,
+                                  figsize=(12, 8))
+    with timing.span('display'):
+        st.image(png)
+    timing.count('png_bytes', len(png))
+
+    # Cross-check the analytic states against the shared finite-difference solver
+    if st.sidebar.checkbox("Validate against the numerical solver"):
+        with timing.span('validate'):
+            n_check, dE, dpsi = simulations.harmonic_oscillator_check(m, omega, n_levels)
+        st.sidebar.caption(f"Lowest {n_check} levels: max |ΔE/E| = {dE:.1e}, max |Δψ| = {dpsi:.1e}")
+
+
+@simulation('Hydrogen Orbitals', requires=('plotly.graph_objects', 'simulations', 'figure_encoding',
+                                           'isosurface_mesh', 'h2_density_stack', 'rhf'))
 def hydrogen_orbitals():
+    import h2_density_stack
+    import rhf
+    import simulations
 
-    # Constants
-    a0 = 1.0  # Bohr radius in arbitrary units
-    
-    def psi_1s(r):
-        """Calculate the wavefunction of 1s orbital."""
-        return (np.pi**-0.5) * np.exp(-r/a0)
-    
-    def plot_3d_psi(R, phase):
-        # Grid setup
-        x = np.linspace(-5, 5, 50)  # Reduced for performance in surface plot
-        y = np.linspace(-5, 5, 50)
-        z = np.linspace(-5, 5, 50)
-        X, Y, Z = np.meshgrid(x, y, z)
-        
-        # Positions of the two hydrogen atoms
-        R1 = np.sqrt((X + R/2)**2 + Y**2 + Z**2)  # Hydrogen 1
-        R2 = np.sqrt((X - R/2)**2 + Y**2 + Z**2)  # Hydrogen 2
-    
-        # Calculate wavefunction for both atoms
-        if phase == 'In-Phase':
-            Psi = psi_1s(R1)**2 + psi_1s(R2)**2
-        else:  # Out-of-Phase
-            Psi = np.abs(psi_1s(R1)**2 - psi_1s(R2)**2)  # Absolute value to visualize the density
-    
-        # Visualization threshold for the isosurface
-        threshold = Psi.max()/10  # Adjust if needed for clearer visualization
-    
-        # Create a 3D isosurface plot
-        fig = go.Figure(data=go.Isosurface(
-            x=X.flatten(),
-            y=Y.flatten(),
-            z=Z.flatten(),
-            value=Psi.flatten(),
-            isomin=threshold,
-            isomax=Psi.max(),
-            surface=dict(count=3, fill=0.7),  # Adjust for surface detail and transparency
-            caps=dict(x_show=False, y_show=False, z_show=False),
-            colorscale='Blues',
-            opacity=0.6  # Adjust for desired transparency
-        ))
-    
-        # Update plot layout
-        fig.update_layout(margin=dict(l=0, r=0, b=0, t=0), scene=dict(aspectmode='cube'))
-    
-        return fig
-    
     st.title('Interactive Visualization of Two Hydrogen Atoms')
 
     phase = st.radio("Choose the orbital phase:", ('In-Phase', 'Out-of-Phase'))
@@ -110,149 +90,146 @@ def hydrogen_orbitals():
 # Using the slider to automatically update the plot
     R = st.slider('Separation distance between hydrogen atoms (in a.u.)', 0.1, 5.0, 2.0, on_change=None)
 
-    fig = plot_3d_psi(R, phase)
-    st.plotly_chart(fig, use_container_width=True)
+    model = st.radio("Density model:", ('Sum of atomic 1s densities', 'Hartree-Fock (STO-3G)'))
+    molecule = st.radio("Molecule:", tuple(rhf.MOLECULES)) if model == 'Hartree-Fock (STO-3G)' else None
+
+    mode = st.radio("Rendering:", ('Server mesh', 'Browser isosurface'))
+    precomputed = molecule is None and st.checkbox('Use precomputed separation sweep', value=True)
+    if precomputed:
+        # Stacks exist for a few fixed grids only, so dragging does not build a new one per position
+        resolution = st.select_slider('Grid points per axis', h2_density_stack.STACK_RESOLUTIONS, 60)
+    else:
+        resolution = st.slider('Grid points per axis', 20, 120, 50)
+    step_size = st.slider('Mesh coarsening (voxels per step)', 1, 4, 1) if mode == 'Server mesh' else 1
+
+    if precomputed:
+        with timing.span('compute'):  # the first use of a grid builds its stack
+            stack = h2_density_stack.get_stack(resolution)
+        st.caption(f"Density stack: {stack.nbytes / 1e6:.1f} MB, built in {stack.build_seconds:.2f} s")
+
+    with timing.span('compute'):
+        data = simulations.hydrogen_orbitals(R, phase, resolution, molecule, precomputed)
+    with timing.span('figure'):
+        fig = simulations.surface_hydrogen_orbitals(data, mode, step_size)
+    show_plotly(fig)
+
+    if molecule is not None:
+        with timing.span('figure'):
+            fig = simulations.dissociation_curve_figure(data)
+        show_plotly(fig)
+        orbital_energies = data['orbital_energies']
+        st.caption(f"E = {data['energy']:.6f} hartree at R = {R:.2f} bohr; orbital energies "
+                   f"{orbital_energies[0]:.4f}, {orbital_energies[1]:.4f}; "
+                   f"{len(data['R_values'])}-point curve computed in {data['curve_seconds']:.2f} s")
 
 
+@simulation('Particle in a Box', requires=('matplotlib', 'figure_cache', 'simulations', 'scipy.constants',
+                                           'schrodinger_1d'))
 def particle_in_a_box():
     # [Paste the Particle in a Box code here, excluding imports and main()]
+    import figure_cache
+    import simulations
     # Sidebar for parameter inputs
     st.sidebar.title("Parameters")
     m = st.sidebar.number_input("Mass of Particle (m)", value=1.0, step=0.1)
     l = st.sidebar.number_input("Length of Box (l)", value=1.0, step=0.1)
-    n_levels = st.sidebar.slider('Number of Energy Levels', 1, 10, 5)
+    n_levels = st.sidebar.slider('Number of Energy Levels', 1, 1000, 5)
     
     # Main content
     st.title('Quantum Particle in a Box Visualization')
-    
-    def wavefunction(n, x, l):
-        """Calculate the wavefunction for a given level, position, and box length."""
-        return np.sqrt(2 / l) * np.sin(n * pi * x / l)
-    
-    def energy_level(n, m, l):
-        """Calculate the energy level for a given level, mass, and box length."""
-        return n**2 * pi**2 * hbar**2 / (2 * m * l**2)
-    
-    # Plotting code
-    fig, ax1 = plt.subplots()
-    
-    x = np.linspace(0, l, 1000)  # x-values within the box
-    
-    # Only one axis is needed since we're aligning everything according to energy levels
-    ax1.set_xlabel('Position (x)')
-    ax1.set_ylabel('Energy / Wave Amplitude')
-    
-    colors = plt.cm.viridis(np.linspace(0, 1, n_levels))
-    
-    for n, color in zip(range(1, n_levels + 1), colors):
-        psi_n = wavefunction(n, x, l)
-        energy = energy_level(n, m, l)
-        
-        # Normalize wavefunction for visualization purposes
-        psi_n_normalized = psi_n / np.max(np.abs(psi_n)) * energy / 10  # Adjust scaling factor as needed
-        
-        # Offset wavefunction to start at its corresponding energy level
-        psi_n_offset = psi_n_normalized + energy
-        
-        # Plot the energy level as a horizontal line
-        ax1.hlines(energy, 0, l, colors='gray', linestyles='dashed', label=f'Energy n={n}' if n == 1 else "")
-    
-        # Plot wavefunction
-        ax1.plot(x, psi_n_offset, label=f'Wavefunction n={n}', color=color)
-        
-        # Plot probability density (squared wavefunction), also offset
-        probability_density_offset = psi_n**2 / np.max(np.abs(psi_n**2)) * energy / 10 + energy  # Adjust scaling
-        ax1.fill_between(x, energy, probability_density_offset, color=color, alpha=0.3)
-    
-    # Adjust layout to make room for the legend
-    #ax1.legend()
-    ax1.grid(True)
-    plt.tight_layout()
-    
-    st.pyplot(fig)
+
+    def draw(page_figure):
+        with timing.span('compute'):
+            data = simulations.particle_in_a_box(m, l, n_levels)
+        with timing.span('figure'):
+            simulations.draw_particle_in_a_box(data, page_figure)
+
+    # Reuse the PNG for repeated parameters, otherwise redraw this session's figure
+    png = figure_cache.cached_png(st.session_state, 'particle_in_a_box', (m, l, n_levels), draw)
+    with timing.span('display'):
+        st.image(png)
+    timing.count('png_bytes', len(png))
+
+    # Cross-check the analytic states against the shared finite-difference solver
+    if st.sidebar.checkbox("Validate against the numerical solver"):
+        with timing.span('validate'):
+            n_check, dE, dpsi = simulations.particle_in_a_box_check(m, l, n_levels)
+        st.sidebar.caption(f"Lowest {n_check} levels: max |ΔE/E| = {dE:.1e}, max |Δψ| = {dpsi:.1e}")
  
 
+@simulation('Particle in a Box 2D', requires=('plotly.graph_objects', 'simulations', 'figure_encoding',
+                                             'scipy.constants', 'box_states', 'schrodinger_nd'))
 def particle_in_a_box_2d():
     # [Paste the Particle in a Box 2D code here, excluding imports and main()]
+    import simulations
 
     # Sidebar for parameter inputs
     st.sidebar.title("Parameters")
     m = st.sidebar.number_input("Mass of Particle (m)", value=1.0, step=0.1)
     Lx = st.sidebar.number_input("Length of Box in x-direction (Lx)", value=1.0, step=0.1)
     Ly = st.sidebar.number_input("Length of Box in y-direction (Ly)", value=1.0, step=0.1)
-    nx = st.sidebar.slider('Quantum Number nx', 1, 10, 1)
-    ny = st.sidebar.slider('Quantum Number ny', 1, 10, 1)
+    select_by = st.sidebar.radio("Choose the state by:", simulations.BOX_2D_MODES)
     
     # Main content
     st.title('3D Visualization of 2D Quantum Particle in a Box')
     
-    def wavefunction(nx, ny, x, y, Lx, Ly):
-        """Calculate the 2D wavefunction for given quantum numbers, positions, and box dimensions."""
-        return np.sqrt(4 / (Lx * Ly)) * np.sin(nx * pi * x / Lx) * np.sin(ny * pi * y / Ly)
-    
-    # Grid for plotting
-    x = np.linspace(0, Lx, 100)
-    y = np.linspace(0, Ly, 100)
-    X, Y = np.meshgrid(x, y)
-    
-    # Calculate wavefunction for given nx, ny
-    psi = wavefunction(nx, ny, X, Y, Lx, Ly)
-    
-    # Plotting
-    fig = go.Figure(data=[go.Surface(z=psi, x=X, y=Y, colorscale='Viridis')])
-    
-    fig.update_layout(title=f'Wavefunction for nx={nx}, ny={ny}', autosize=True,
-                      scene=dict(
-                          xaxis_title='X',
-                          yaxis_title='Y',
-                          zaxis_title='Wave Amplitude',
-                          aspectratio=dict(x=1, y=1, z=0.5)),
-                      )
-    
-    st.plotly_chart(fig, use_container_width=True)
+    params = dict(m=m, Lx=Lx, Ly=Ly, select_by=select_by)
+    if select_by == 'Quantum numbers' and st.sidebar.checkbox("Switch states in the browser (all 100 sent once)"):
+        # Every (nx, ny) <= 10 in one payload; the plot's slider swaps states without a rerun
+        with timing.span('figure'):
+            fig = simulations.particle_in_a_box_2d_frames(Lx, Ly)
+        show_plotly(fig)
+        st.caption("Drag the slider under the plot: the states change in the browser, without rerunning Python.")
+        return
+    elif select_by == 'Quantum numbers':
+        params['nx'] = st.sidebar.slider('Quantum Number nx', 1, 10, 1)
+        params['ny'] = st.sidebar.slider('Quantum Number ny', 1, 10, 1)
+    elif select_by == 'Energy order':
+        params['k'] = st.sidebar.number_input("State number in energy order (1 = ground state)",
+                                              min_value=1, max_value=100000, value=1, step=1)
+    else:
+        params['height'] = st.sidebar.slider("Bump height (in units of the ground-state energy)", 0.0, 50.0, 10.0)
+        params['width'] = st.sidebar.slider("Bump width (fraction of the shorter side)", 0.05, 0.5, 0.15)
+        params['k'] = st.sidebar.slider("State number in energy order (1 = ground state)", 1, 10, 1)
+        # Warm-start the sparse solver from the states of the previous slider position
+        params['guess'] = st.session_state.get('box_2d_states')
+
+    with timing.span('compute'):
+        data = simulations.particle_in_a_box_2d(**params)
+    if data['states'] is not None:
+        st.session_state['box_2d_states'] = data['states']
+    if data['info'] is not None:
+        st.sidebar.write(data['info'])
+    if data['warning'] is not None:
+        st.warning(data['warning'])
+    if data['table'] is not None:
+        with st.expander("Energy levels around this state"):
+            st.table(data['table'])
 
+    with timing.span('figure'):
+        fig = simulations.surface_particle_in_a_box_2d(data)
+    show_plotly(fig)
 
+
+@simulation('Rigid Rotor', requires=('plotly.graph_objects', 'simulations', 'figure_encoding',
+                                     'spherical_harmonics'))
 def rigid_rotor():
     # [Paste the Rigid Rotor code here, excluding imports and main()]
+    import simulations
 
-
-    def plot_wavefunction_with_plotly(J, M):
-        # Ensure M is within the valid range
-        M = max(-J, min(J, M))
-    
-        # Angles
-        phi, theta = np.mgrid[0:np.pi:50j, 0:2*np.pi:100j]
-    
-        # Spherical harmonics
-        Y = sph_harm(M, J, theta, phi)
-    
-        # Cartesian coordinates
-        r = np.abs(Y)
-        x = r * np.sin(phi) * np.cos(theta)
-        y = r * np.sin(phi) * np.sin(theta)
-        z = r * np.cos(phi)
-    
-        # Create the plot
-        fig = go.Figure(data=[go.Surface(z=z, x=x, y=y, colorscale='Viridis')])
-    
-        # Update layout for a better view
-        fig.update_layout(title=f'Wavefunction for l = {J}, m = {M}', autosize=True,
-                          scene=dict(
-                              xaxis_title='X',
-                              yaxis_title='Y',
-                              zaxis_title='Z',
-                              xaxis=dict(nticks=4, range=[-0.5,0.5]),
-                              yaxis=dict(nticks=4, range=[-0.5,0.5]),
-                              zaxis=dict(nticks=4, range=[-0.5,0.5]),
-                          ),
-                          margin=dict(l=65, r=50, b=65, t=90))
-        st.plotly_chart(fig, use_container_width=True)
-    
     # Streamlit UI
     st.title('Interactive Rigid Rotor Wavefunctions with Plotly')
+
+    if st.sidebar.checkbox("Switch states in the browser (all 36 with l ≤ 5 sent once)"):
+        # Every (l, m) up to l = 5 in one payload; the plot's slider swaps states without a rerun
+        with timing.span('figure'):
+            fig = simulations.rigid_rotor_frames()
+        show_plotly(fig)
+        st.caption("Drag the slider under the plot: the states change in the browser, without rerunning Python.")
+        return
     
     # Slider for J
-    J = st.slider('l:', 0, 5, 0)
+    J = st.slider('l:', 0, simulations.L_MAX, 0)
     
     # Conditionally set M slider's range
     if J == 0:
@@ -266,7 +243,11 @@ def rigid_rotor():
         M = st.slider('M:', M_min, M_max, 0)
     
     # Plotting with Plotly for interactivity
-    plot_wavefunction_with_plotly(J, M)
+    with timing.span('compute'):
+        data = simulations.rigid_rotor(J, M)
+    with timing.span('figure'):
+        fig = simulations.surface_rigid_rotor(data)
+    show_plotly(fig)
 
 
 
@@ -275,19 +256,39 @@ def main():
     st.sidebar.write("beta version")
     app_option = st.sidebar.radio(
         "Choose the simulation:",
-        ('Harmonic Oscillator', 'Hydrogen Orbitals', 'Particle in a Box', 'Particle in a Box 2D', 'Rigid Rotor')
+        tuple(SIMULATIONS)
     )
 
-    if app_option == 'Harmonic Oscillator':
-        harmonic_oscillator()
-    elif app_option == 'Hydrogen Orbitals':
-        hydrogen_orbitals()
-    elif app_option == 'Particle in a Box':
-        particle_in_a_box()
-    elif app_option == 'Particle in a Box 2D':
-        particle_in_a_box_2d()
-    elif app_option == 'Rigid Rotor':
-        rigid_rotor()
+    # Leaving a page frees the Matplotlib figure the session kept for it; its PNGs stay cached
+    previous = st.session_state.get('_page')
+    if previous != app_option and previous in SIMULATIONS and 'figure_cache' in SIMULATIONS[previous][1]:
+        import figure_cache
+        figure_cache.release_figures(st.session_state)
+    st.session_state['_page'] = app_option
+
+    import_seconds = load_requirements(app_option)
+    st.sidebar.caption(f"Page imports: {import_seconds * 1000:.0f} ms")
+    show_timing = st.sidebar.checkbox("Show timing diagnostics")
+    diagnostics = st.sidebar.container()  # filled once the page has run
+
+    # Every rerun is traced into the JSON-lines log; summarize it with `python timing.py`
+    session = st.session_state.setdefault('_timing_session', uuid.uuid4().hex[:12])
+    page, _ = SIMULATIONS[app_option]
+    with timing.rerun(app_option, session) as trace:
+        page()
+
+    if show_timing:
+        with diagnostics:
+            sent = ', '.join(f"{name} {amount / 1024:.1f} kB" for name, amount in trace.counters.items())
+            st.caption(f"This rerun: {trace.seconds * 1000:.0f} ms" + (f"; {sent}" if sent else ""))
+            st.dataframe({'phase': list(trace.spans), 'ms': [seconds * 1000 for seconds in trace.spans.values()]},
+                         hide_index=True)
+            summary = timing.summarize(timing.read_log(max_records=5000)).get(app_option, {})
+            if summary:
+                st.caption(f"{app_option}, recent reruns across sessions")
+                st.dataframe({'phase': list(summary), 'n': [stats['n'] for stats in summary.values()],
+                              **{f'p{q} (ms)': [stats[f'p{q}'] * 1000 for stats in summary.values()]
+                                 for q in timing.PERCENTILES}}, hide_index=True)
 
 if __name__ == "__main__":
     main()
@@ -1,7 +1,9 @@
 import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
-from scipy.constants import hbar, pi
+from scipy.constants import hbar
+import box_states
+import schrodinger_nd
 
 def main():
 
@@ -10,28 +12,64 @@ def main():
     m = st.sidebar.number_input("Mass of Particle (m)", value=1.0, step=0.1)
     Lx = st.sidebar.number_input("Length of Box in x-direction (Lx)", value=1.0, step=0.1)
     Ly = st.sidebar.number_input("Length of Box in y-direction (Ly)", value=1.0, step=0.1)
-    nx = st.sidebar.slider('Quantum Number nx', 1, 10, 1)
-    ny = st.sidebar.slider('Quantum Number ny', 1, 10, 1)
+    select_by = st.sidebar.radio("Choose the state by:",
+                                 ('Quantum numbers', 'Energy order', 'Numerical, with a central bump'))
     
     # Main content
     st.title('3D Visualization of 2D Quantum Particle in a Box')
     
-    def wavefunction(nx, ny, x, y, Lx, Ly):
-        """Calculate the 2D wavefunction for given quantum numbers, positions, and box dimensions."""
-        return np.sqrt(4 / (Lx * Ly)) * np.sin(nx * pi * x / Lx) * np.sin(ny * pi * y / Ly)
-    
-    # Grid for plotting
-    x = np.linspace(0, Lx, 100)
-    y = np.linspace(0, Ly, 100)
+    if select_by == 'Quantum numbers':
+        nx = st.sidebar.slider('Quantum Number nx', 1, 10, 1)
+        ny = st.sidebar.slider('Quantum Number ny', 1, 10, 1)
+    elif select_by == 'Energy order':
+        k = st.sidebar.number_input("State number in energy order (1 = ground state)",
+                                    min_value=1, max_value=100000, value=1, step=1)
+        # List a few states past k so the degeneracy of state k is complete
+        energies, states = box_states.lowest_states(k + 64, (Lx, Ly), m, hbar)
+        nx, ny = (int(n) for n in states[k - 1])
+        groups = box_states.degeneracy_groups(energies)
+        level = next(i for i, (start, stop) in enumerate(groups) if start < k <= stop)
+        st.sidebar.write(f"State {k}: nx={nx}, ny={ny}, E = {energies[k - 1]:.4e} J, "
+                         f"degeneracy {groups[level][1] - groups[level][0]}")
+        with st.expander("Energy levels around this state"):
+            st.table([{'level': i + 1,
+                       'E (J)': f"{energies[start]:.4e}",
+                       'degeneracy': stop - start,
+                       '(nx, ny)': ', '.join(f"({a}, {b})" for a, b in states[start:stop])}
+                      for i, (start, stop) in enumerate(groups[:-1])
+                      if abs(i - level) <= 10])
+    else:
+        height = st.sidebar.slider("Bump height (in units of the ground-state energy)", 0.0, 50.0, 10.0)
+        width = st.sidebar.slider("Bump width (fraction of the shorter side)", 0.05, 0.5, 0.15)
+        k = st.sidebar.slider("State number in energy order (1 = ground state)", 1, 10, 1)
+        E_11 = box_states.energy((1, 1), (Lx, Ly), m, hbar)
+        sigma = width * min(Lx, Ly)
+
+        def potential(X, Y):
+            return height * E_11 * np.exp(-((X - Lx / 2)**2 + (Y - Ly / 2)**2) / (2 * sigma**2))
+
+        # Sparse solver, warm-started from the states of the previous slider position
+        energies, (x, y), states = schrodinger_nd.solve(potential, [(0, Lx), (0, Ly)], 96, 10, m, hbar,
+                                                       guess=st.session_state.get('box_2d_states'))
+        st.session_state['box_2d_states'] = states
+        psi = states[k - 1].T  # meshgrid(x, y) order
+        title = f'Numerical state {k} with a central bump'
+        st.sidebar.write(f"State {k}: E = {energies[k - 1]:.4e} J = {energies[k - 1] / E_11:.3f} E₁₁")
+
+    if select_by != 'Numerical, with a central bump':
+        # Wavefunction as an outer product of cached 1D sine tables, with >= 4 points per half-wave
+        n_points = [box_states.grid_points(n) for n in (nx, ny)]
+        (x, y), psi = box_states.wavefunction((nx, ny), (Lx, Ly), n_points)
+        if max(nx, ny) > (box_states.MAX_GRID_POINTS - 1) // 4:
+            st.warning(f"nx={nx}, ny={ny} has too many half-waves for the {box_states.MAX_GRID_POINTS}-point "
+                       "grid; the surface is under-resolved and may show a moire pattern")
+        title = f'Wavefunction for nx={nx}, ny={ny}'
     X, Y = np.meshgrid(x, y)
     
-    # Calculate wavefunction for given nx, ny
-    psi = wavefunction(nx, ny, X, Y, Lx, Ly)
-    
     # Plotting
     fig = go.Figure(data=[go.Surface(z=psi, x=X, y=Y, colorscale='Viridis')])
     
-    fig.update_layout(title=f'Wavefunction for nx={nx}, ny={ny}', autosize=True,
+    fig.update_layout(title=title, autosize=True,
                       scene=dict(
                           xaxis_title='X',
                           yaxis_title='Y',
@@ -0,0 +1,45 @@
+import importlib.util
+import os
+import threading
+
+# Streamlit re-executes the launcher script on every interaction, but imported modules
+# survive in sys.modules, so this cache lives here for the lifetime of the server process.
+_modules = {}  # absolute path -> (mtime, module)
+_lock = threading.Lock()
+_prewarm_started = False
+
+
+def load_app(path):
+    """Return the module for an app file, executing it only if it is new or its mtime changed."""
+    path = os.path.abspath(path)
+    mtime = os.path.getmtime(path)
+    with _lock:
+        cached = _modules.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        name = "qm_app_" + os.path.splitext(os.path.basename(path))[0]
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _modules[path] = (mtime, module)
+        return module
+
+
+def prewarm(paths):
+    """Load every app in a background thread, once per process, so the first switch is cheap."""
+    global _prewarm_started
+    with _lock:
+        if _prewarm_started:
+            return
+        _prewarm_started = True
+
+    def warm():
+        for path in paths:
+            try:
+                load_app(path)
+            except Exception:
+                # A broken app should only fail when it is actually selected
+                pass
+
+    threading.Thread(target=warm, name="qm-app-prewarm", daemon=True).start()
@@ -1,6 +1,6 @@
 import streamlit as st
-import importlib.util
-import sys
+import os
+import app_loader
 
 st.title("Quantum chemistry interactive apps")
 st.markdown("Select app from drop-down menu")
@@ -14,6 +14,11 @@ apps = {
     "Particle in a Box 2D": "particle_in_a_box_2D.py",
     "Rigid Rotor": "rigid_rotor.py"
 }
+app_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Load every app in the background at server start; set QM_PREWARM=0 to disable
+if os.environ.get("QM_PREWARM", "1") != "0":
+    app_loader.prewarm([os.path.join(app_dir, path) for path in apps.values()])
 
 # Dropdown to select the app
 selected_app = st.selectbox("Select an app to run:", list(apps.keys()))
@@ -21,16 +26,13 @@ selected_app = st.selectbox("Select an app to run:", list(apps.keys()))
 # Button to run the app
 if st.button("Run App"):
     # Get the file of the selected app
-    app_path = apps[selected_app]
+    app_path = os.path.join(app_dir, apps[selected_app])
 
-    # Load the module dynamically
-    spec = importlib.util.spec_from_file_location("module.name", app_path)
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
+    # Load the module, reusing the cached one unless the file changed on disk
+    module = app_loader.load_app(app_path)
 
     # Execute the main function of the app, if you follow this pattern in your sub-apps
     if hasattr(module, 'main'):
         module.main()
     else:
         st.error("No main function found in the selected app!")
-
@@ -1,7 +1,14 @@
+import os
+import sys
 import streamlit as st
 import numpy as np
 import plotly.graph_objects as go
-from scipy.special import sph_harm
+
+# Shared engine modules live in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import spherical_harmonics
+
+L_MAX = 5  # Highest l offered by the slider
 
 def main():
 
@@ -9,14 +16,16 @@ def main():
         # Ensure M is within the valid range
         M = max(-J, min(J, M))
     
-        # Angles
-        phi, theta = np.mgrid[0:np.pi:50j, 0:2*np.pi:100j]
+        # Shared angle grid with every Y_lm up to L_MAX, computed once per process
+        Y_table = spherical_harmonics.table(L_MAX, 50, 100)
+        phi, theta = np.meshgrid(Y_table.polar, Y_table.azimuth, indexing='ij')
     
-        # Spherical harmonics
-        Y = sph_harm(M, J, theta, phi)
+        # Spherical harmonics (a table lookup rather than a special-function call)
+        Y = Y_table(J, M)
     
         # Cartesian coordinates
         r = np.abs(Y)
+        axis_range = [-max(0.5, r.max()), max(0.5, r.max())]  # Keep high-l lobes in view
         x = r * np.sin(phi) * np.cos(theta)
         y = r * np.sin(phi) * np.sin(theta)
         z = r * np.cos(phi)
@@ -30,9 +39,9 @@ def main():
                               xaxis_title='X',
                               yaxis_title='Y',
                               zaxis_title='Z',
-                              xaxis=dict(nticks=4, range=[-0.5,0.5]),
-                              yaxis=dict(nticks=4, range=[-0.5,0.5]),
-                              zaxis=dict(nticks=4, range=[-0.5,0.5]),
+                              xaxis=dict(nticks=4, range=axis_range),
+                              yaxis=dict(nticks=4, range=axis_range),
+                              zaxis=dict(nticks=4, range=axis_range),
                           ),
                           margin=dict(l=65, r=50, b=65, t=90))
         st.plotly_chart(fig, use_container_width=True)
@@ -41,7 +50,7 @@ def main():
     st.title('Interactive Rigid Rotor Wavefunctions with Plotly')
     
     # Slider for J
-    J = st.slider('l:', 0, 5, 0)
+    J = st.slider('l:', 0, L_MAX, 0)
     
     # Conditionally set M slider's range
     if J == 0:
@@ -1,12 +1,27 @@
 ## Merging all apps in one code
+import os
+import sys
 import streamlit as st
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.special import hermite, sph_harm
+from scipy.special import hermite
 from scipy.constants import hbar, pi
 import plotly.graph_objects as go
 import math
 
+# Shared engine modules live in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import figure_encoding
+import oscillator_engine
+import schrodinger_1d
+import schrodinger_nd
+import spherical_harmonics
+import transfer_matrix
+import vibronic
+import wavepacket
+
+L_MAX = 5  # Highest l offered by the rigid-rotor slider
+
 # Define the individual app functions
 def harmonic_oscillator():
     # [Paste the Harmonic Oscillator code here, excluding imports and main()]
@@ -220,14 +235,16 @@ def rigid_rotor():
         # Ensure M is within the valid range
         M = max(-J, min(J, M))
     
-        # Angles
-        phi, theta = np.mgrid[0:np.pi:50j, 0:2*np.pi:100j]
+        # Shared angle grid with every Y_lm up to L_MAX, computed once per process
+        Y_table = spherical_harmonics.table(L_MAX, 50, 100)
+        phi, theta = np.meshgrid(Y_table.polar, Y_table.azimuth, indexing='ij')
     
-        # Spherical harmonics
-        Y = sph_harm(M, J, theta, phi)
+        # Spherical harmonics (a table lookup rather than a special-function call)
+        Y = Y_table(J, M)
     
         # Cartesian coordinates
         r = np.abs(Y)
+        axis_range = [-max(0.5, r.max()), max(0.5, r.max())]  # Keep high-l lobes in view
         x = r * np.sin(phi) * np.cos(theta)
         y = r * np.sin(phi) * np.sin(theta)
         z = r * np.cos(phi)
@@ -241,9 +258,9 @@ def rigid_rotor():
                               xaxis_title='X',
                               yaxis_title='Y',
                               zaxis_title='Z',
-                              xaxis=dict(nticks=4, range=[-0.5,0.5]),
-                              yaxis=dict(nticks=4, range=[-0.5,0.5]),
-                              zaxis=dict(nticks=4, range=[-0.5,0.5]),
+                              xaxis=dict(nticks=4, range=axis_range),
+                              yaxis=dict(nticks=4, range=axis_range),
+                              zaxis=dict(nticks=4, range=axis_range),
                           ),
                           margin=dict(l=65, r=50, b=65, t=90))
         st.plotly_chart(fig, use_container_width=True)
@@ -252,7 +269,7 @@ def rigid_rotor():
     st.title('Interactive Rigid Rotor Wavefunctions with Plotly')
     
     # Slider for J
-    J = st.slider('l:', 0, 5, 0)
+    J = st.slider('l:', 0, L_MAX, 0)
     
     # Conditionally set M slider's range
     if J == 0:
@@ -274,32 +291,47 @@ def harmonic_oscillator_2d():
     m = st.sidebar.number_input("Mass of Particle (m)", value=1.0, step=0.1)
     omega_x = st.sidebar.number_input("Angular frequency in x-direction (ωx)", value=1.0, step=0.1)
     omega_y = st.sidebar.number_input("Angular frequency in y-direction (ωy)", value=1.0, step=0.1)
-    nx = st.sidebar.slider('Quantum Number nx', 0, 5, 0)
-    ny = st.sidebar.slider('Quantum Number ny', 0, 5, 0)
+    solver = st.sidebar.radio("Solve with:", ('Analytic (separable)', 'Numerical (coupled, anharmonic)'))
 
     # Main content
     st.title('2D Quantum Harmonic Oscillator Visualization')
-    
-    def wavefunction_2d(nx, ny, x, y, omega_x, omega_y):
-        """Calculate the 2D wavefunction for given quantum numbers, positions, and angular frequencies."""
-        hermite_x = hermite(nx)
-        hermite_y = hermite(ny)
-        psi_x = hermite_x(np.sqrt(m * omega_x / hbar) * x) * np.exp(-m * omega_x * x**2 / (2 * hbar))
-        psi_y = hermite_y(np.sqrt(m * omega_y / hbar) * y) * np.exp(-m * omega_y * y**2 / (2 * hbar))
-        return psi_x * psi_y
-
-    # Grid for plotting
-    x = np.linspace(-5, 5, 100)
-    y = np.linspace(-5, 5, 100)
-    X, Y = np.meshgrid(x, y)
-
-    # Calculate wavefunction for given nx, ny
-    psi = wavefunction_2d(nx, ny, X, Y, omega_x, omega_y)
 
-    # Plotting
-    fig = go.Figure(data=[go.Surface(z=psi, x=X, y=Y, colorscale='Viridis')])
-
-    fig.update_layout(title=f'Wavefunction for nx={nx}, ny={ny}', autosize=True,
+    if solver == 'Analytic (separable)':
+        nx = st.sidebar.slider('Quantum Number nx', 0, 5, 0)
+        ny = st.sidebar.slider('Quantum Number ny', 0, 5, 0)
+
+        # Grid for plotting
+        x = np.linspace(-5, 5, 100)
+        y = np.linspace(-5, 5, 100)
+
+        # Normalized product state in units with ħ = 1, like the numerical solver; with the SI ħ
+        # the Gaussians underflowed to zero everywhere on this grid
+        psi_x = oscillator_engine.eigenstates_on(x, m, omega_x, nx + 1)[nx]
+        psi_y = oscillator_engine.eigenstates_on(y, m, omega_y, ny + 1)[ny]
+        psi = np.outer(psi_y, psi_x)  # meshgrid(x, y) order
+        E = omega_x * (nx + 0.5) + omega_y * (ny + 0.5)
+        title = f'Wavefunction for nx={nx}, ny={ny}, E = {E:.4f} (ħ = 1)'
+    else:
+        coupling = st.sidebar.slider("Coupling λ (adds λxy)", -0.9, 0.9, 0.3)
+        quartic = st.sidebar.slider("Anharmonicity g (adds g(x⁴ + y⁴))", 0.0, 0.5, 0.0)
+        k = st.sidebar.slider("State number in energy order (1 = ground state)", 1, 10, 1)
+
+        def potential(X, Y):
+            return (0.5 * m * (omega_x**2 * X**2 + omega_y**2 * Y**2) + coupling * X * Y
+                    + quartic * (X**4 + Y**4))
+
+        # Sparse Kronecker-sum solver in units with ħ = 1, warm-started from the previous slider position
+        energies, (x, y), states = schrodinger_nd.solve(potential, [(-6, 6), (-6, 6)], 128, 10, m,
+                                                       guess=st.session_state.get('oscillator_2d_states'))
+        st.session_state['oscillator_2d_states'] = states
+        psi = states[k - 1].T  # meshgrid(x, y) order
+        title = f'Numerical state {k}, E = {energies[k - 1]:.4f} (ħ = 1)'
+        st.sidebar.write("Lowest energies: " + ", ".join(f"{E:.3f}" for E in energies))
+
+    # Plotting: 1D axes and float32 typed arrays, thinned to the surface byte budget
+    fig = go.Figure(data=[figure_encoding.surface(psi, x, y, colorscale='Viridis')])
+
+    fig.update_layout(title=title, autosize=True,
                       scene=dict(
                           xaxis_title='X',
                           yaxis_title='Y',
@@ -312,6 +344,7 @@ def harmonic_oscillator_2d():
 
 def free_particle_1d():
     st.sidebar.title("Parameters")
+    mode = st.sidebar.radio("Show:", ('Plane wave', 'Wavepacket in time'))
     k = st.sidebar.number_input("Wave number (k)", value=1.0, step=0.1)
     A = st.sidebar.number_input("Amplitude (A)", value=1.0, step=0.1)
     x_min = st.sidebar.number_input("Minimum x", value=-10.0, step=1.0)
@@ -319,6 +352,10 @@ def free_particle_1d():
 
     st.title('Quantum Free Particle in 1D')
 
+    if mode == 'Wavepacket in time':
+        free_wavepacket_1d(k, x_min, x_max)
+        return
+
     def wavefunction_free_particle(x, k, A):
         """Calculate the wavefunction for a free particle."""
         return A * np.exp(1j * k * x)
@@ -337,171 +374,242 @@ def free_particle_1d():
     plt.grid(True)
     st.pyplot(plt)
 
+def free_wavepacket_1d(k, x_min, x_max):
+    x0 = st.sidebar.number_input("Initial center (x₀)", value=(3 * x_min + x_max) / 4, step=0.5)
+    sigma = st.sidebar.number_input("Initial width (σ)", value=1.0, min_value=0.1, step=0.1)
+    t_max = st.sidebar.number_input("Duration (t)", value=5.0, min_value=0.1, step=0.5)
+    n_frames = st.sidebar.slider("Animation frames", 10, 200, 60)
+
+    if x_max <= x_min:
+        st.error("Maximum x must be larger than minimum x.")
+        return
+
+    # Split-operator FFT propagation; every frame is shipped in one Plotly payload. The step
+    # is at most 0.005 and divides the frame interval, so the last frame lands on t exactly.
+    x = np.linspace(x_min, x_max, 1024, endpoint=False)
+    steps_per_frame = max(1, math.ceil(t_max / (n_frames - 1) / 0.005))
+    propagator = wavepacket.SplitOperator(x, t_max / ((n_frames - 1) * steps_per_frame))
+    snapshots = list(propagator.frames(wavepacket.gaussian_packet(x, x0, sigma, k), n_frames, steps_per_frame))
+
+    def traces(psi):
+        # Frames only carry y; x comes from the initial traces
+        return [go.Scatter(y=np.real(psi).astype(np.float32)),
+                go.Scatter(y=np.imag(psi).astype(np.float32)),
+                go.Scatter(y=np.abs(psi).astype(np.float32))]
+
+    peak = np.abs(snapshots[0][1]).max()
+    psi0 = snapshots[0][1]
+    fig = go.Figure(
+        data=[go.Scatter(x=x, y=np.real(psi0), name='Re ψ'),
+              go.Scatter(x=x, y=np.imag(psi0), name='Im ψ', line=dict(dash='dash')),
+              go.Scatter(x=x, y=np.abs(psi0), name='|ψ|', line=dict(dash='dot'))],
+        frames=[go.Frame(data=traces(psi), name=f"{t:.2f}") for t, psi in snapshots],
+    )
+    fig.update_layout(
+        title="Gaussian Wavepacket of a Free Particle",
+        xaxis_title="Position (x)",
+        yaxis=dict(title="Wavefunction ψ(x, t)", range=[-1.1 * peak, 1.1 * peak]),
+        updatemenus=[dict(type='buttons', showactive=False, buttons=[
+            dict(label='Play', method='animate',
+                 args=[None, dict(frame=dict(duration=50, redraw=False), fromcurrent=True)]),
+            dict(label='Pause', method='animate',
+                 args=[[None], dict(frame=dict(duration=0, redraw=False), mode='immediate')]),
+        ])],
+        sliders=[dict(currentvalue=dict(prefix='t = '), steps=[
+            dict(label=frame.name, method='animate',
+                 args=[[frame.name], dict(frame=dict(duration=0, redraw=False), mode='immediate')])
+            for frame in fig.frames
+        ])],
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
 def quantum_tunneling():
     st.sidebar.title("Parameters")
+    structure = st.sidebar.radio("Structure:", ('Single barrier', 'Double barrier', 'Superlattice'))
     V0 = st.sidebar.number_input("Barrier height (V₀)", value=10.0, step=0.1)
     E = st.sidebar.number_input("Energy of particle (E)", value=5.0, step=0.1)
     a = st.sidebar.number_input("Barrier width (a)", value=2.0, step=0.1)
+    if structure == 'Single barrier':
+        barriers = transfer_matrix.barrier(V0, a)
+    else:
+        gap = st.sidebar.number_input("Well width between barriers", value=2.0, step=0.1)
+        periods = 2 if structure == 'Double barrier' else st.sidebar.slider("Number of barriers", 3, 50, 10)
+        barriers = transfer_matrix.superlattice(V0, a, gap, periods)
     x_min = st.sidebar.number_input("Minimum x", value=-10.0, step=1.0)
     x_max = st.sidebar.number_input("Maximum x", value=10.0, step=1.0)
 
     st.title('Quantum Tunneling Through a Potential Barrier')
+    st.caption("Units with ħ = m = 1; the wave comes in from the left with unit amplitude.")
 
-    def wavefunction_tunneling(x, V0, E, a):
-        """Calculate the wavefunction for quantum tunneling."""
-        k1 = np.sqrt(2 * E / hbar**2) if E > 0 else 0
-        k2 = np.sqrt(2 * (V0 - E) / hbar**2) if E < V0 else k1
-
-        def psi_left(x):  # Left region (before the barrier)
-            return np.exp(1j * k1 * x) + np.exp(-1j * k1 * x)
-
-        def psi_barrier(x):  # Inside the barrier
-            return np.exp(-k2 * x) + np.exp(k2 * x)
-
-        def psi_right(x):  # Right region (after the barrier)
-            return np.exp(1j * k1 * x)
-
-        psi = np.piecewise(x,
-                           [x < -a / 2, (-a / 2 <= x) & (x <= a / 2), x > a / 2],
-                           [psi_left, psi_barrier, psi_right])
-
-        return psi
-
+    # Transfer-matrix solution: exact for piecewise-constant potentials
     x = np.linspace(x_min, x_max, 1000)
-    psi = wavefunction_tunneling(x, V0, E, a)
-
-    plt.figure(figsize=(12, 6))
-    plt.plot(x, np.real(psi), label='Real part of ψ(x)')
-    plt.plot(x, np.imag(psi), label='Imaginary part of ψ(x)', linestyle='dashed')
-    plt.plot(x, np.abs(psi), label='|ψ(x)|', linestyle='dotted')
-    plt.axvline(-a/2, color='red', linestyle='--', label='Barrier start')
-    plt.axvline(a/2, color='red', linestyle='--', label='Barrier end')
-    plt.xlabel("Position (x)")
-    plt.ylabel("Wavefunction ψ(x)")
-    plt.title("Wavefunction for Quantum Tunneling")
-    plt.legend()
-    plt.grid(True)
-    st.pyplot(plt)
+    psi = barriers.wavefunction(x, E)
+    energies = np.linspace(0.01, max(3 * V0, 1.5 * E), 4000)
+    T, R = barriers.transmission(energies)
+    T_E, R_E = barriers.transmission(E)
+    st.sidebar.markdown(f"**T(E)** = {T_E[0]:.4g}, **R(E)** = {R_E[0]:.4g}")
+
+    # Explicit figures: two charts on one page must not share pyplot's current figure
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.plot(x, np.real(psi), label='Real part of ψ(x)')
+    ax.plot(x, np.imag(psi), label='Imaginary part of ψ(x)', linestyle='dashed')
+    ax.plot(x, np.abs(psi), label='|ψ(x)|', linestyle='dotted')
+    scale = np.abs(psi).max() / V0 if V0 else 1.0
+    ax.fill_between(x, 0, scale * barriers.potential(x), color='red', alpha=0.15, step='mid',
+                    label='Barriers (scaled)')
+    ax.set_xlabel("Position (x)")
+    ax.set_ylabel("Wavefunction ψ(x)")
+    ax.set_title("Wavefunction for Quantum Tunneling")
+    ax.legend()
+    ax.grid(True)
+    st.pyplot(fig)
+    plt.close(fig)
+
+    fig, ax = plt.subplots(figsize=(12, 4))
+    ax.plot(energies, T, label='Transmission T(E)')
+    ax.plot(energies, R, label='Reflection R(E)', linestyle='dashed')
+    ax.axvline(E, color='black', linestyle=':', label='Particle energy')
+    ax.axvline(V0, color='red', linestyle='--', label='Barrier height')
+    ax.set_xlabel("Energy (E)")
+    ax.set_ylabel("Probability")
+    ax.set_title("Transmission and Reflection Spectra")
+    ax.legend()
+    ax.grid(True)
+    st.pyplot(fig)
+    plt.close(fig)
 
 def particle_in_finite_well():
     st.sidebar.title("Parameters")
-    V0 = st.sidebar.number_input("Potential well depth (V₀)", value=10.0, step=0.1)
-    L = st.sidebar.number_input("Width of the well (L)", value=2.0, step=0.1)
-    E = st.sidebar.number_input("Energy of the particle (E)", value=5.0, step=0.1)
+    V0 = st.sidebar.number_input("Potential well depth (V₀)", value=10.0, min_value=0.1, step=0.1)
+    L = st.sidebar.number_input("Width of the well (L)", value=2.0, min_value=0.1, step=0.1)
     x_min = st.sidebar.number_input("Minimum x", value=-10.0, step=1.0)
     x_max = st.sidebar.number_input("Maximum x", value=10.0, step=1.0)
 
     st.title('Particle in a Finite Potential Well')
+    st.caption("Units with ħ = m = 1; the bound states come from the finite-difference solver.")
 
-    def wavefunction_finite_well(x, V0, L, E):
-        """Calculate the wavefunction for a particle in a finite potential well."""
-        k1 = np.sqrt(2 * E / hbar**2) if E < V0 else 0  # Inside the well
-        k2 = np.sqrt(2 * (V0 - E) / hbar**2) if E < V0 else np.sqrt(2 * (E - V0) / hbar**2)  # Outside the well
-
-        def psi_left(x):  # Left region (before the well)
-            return np.exp(k2 * x)
+    if not (x_min < -L / 2 and L / 2 < x_max):
+        st.error("The x range must contain the whole well.")
+        return
 
-        def psi_well(x):  # Inside the well
-            return np.sin(k1 * (x + L / 2))
-
-        def psi_right(x):  # Right region (after the well)
-            return np.exp(-k2 * x)
+    def potential(x):
+        """Well of depth V0 on [-L/2, L/2], zero energy at its bottom, averaged over each grid cell.
 
-        psi = np.piecewise(x,
-                           [x < -L / 2, (-L / 2 <= x) & (x <= L / 2), x > L / 2],
-                           [psi_left, psi_well, psi_right])
+        Averaging keeps the well L wide on any grid; a sampled step adds up to one cell
+        and lowers the energies by ~dx/L.
+        """
+        inside = np.clip((L / 2 - np.abs(x)) / (x[1] - x[0]) + 0.5, 0, 1)
+        return V0 * (1 - inside)
 
-        return psi
+    # Bound states have E < V0; there are at most L sqrt(2 V0) / pi + 1 of them
+    n_max = int(L * np.sqrt(2 * V0) / np.pi) + 1
+    energies, x, psi = schrodinger_1d.solve(potential, x_min, x_max, n_max + 1, 4001)
+    bound = np.flatnonzero(energies < V0)
+    st.sidebar.write(f"{bound.size} bound state(s): " + ", ".join(f"E{n + 1} = {energies[n]:.4f}" for n in bound))
 
-    x = np.linspace(x_min, x_max, 1000)
-    psi = wavefunction_finite_well(x, V0, L, E)
+    scale = 0.4 * V0 / max(bound.size, 1) / np.abs(psi[bound]).max() if bound.size else 0
 
     plt.figure(figsize=(12, 6))
-    plt.plot(x, np.real(psi), label='Real part of ψ(x)')
-    plt.plot(x, np.imag(psi), label='Imaginary part of ψ(x)', linestyle='dashed')
-    plt.plot(x, np.abs(psi), label='|ψ(x)|', linestyle='dotted')
+    plt.plot(x, potential(x), color='black', label='Potential V(x)')
+    for n in bound:
+        line, = plt.plot(x, energies[n] + scale * psi[n], label=f'ψ{n + 1}(x), E = {energies[n]:.3f}')
+        plt.axhline(energies[n], color=line.get_color(), linestyle='--', linewidth=0.8)
     plt.axvline(-L/2, color='red', linestyle='--', label='Well boundary start')
     plt.axvline(L/2, color='red', linestyle='--', label='Well boundary end')
     plt.xlabel("Position (x)")
-    plt.ylabel("Wavefunction ψ(x)")
-    plt.title("Wavefunction for Particle in a Finite Potential Well")
+    plt.ylabel("Energy / Wavefunction ψ(x)")
+    plt.title("Bound States of a Particle in a Finite Potential Well")
     plt.legend()
     plt.grid(True)
     st.pyplot(plt)
 
-import streamlit as st
-import numpy as np
-import matplotlib.pyplot as plt
-from scipy.constants import hbar, pi
-from scipy.special import factorial
-from scipy.integrate import simps
-
 def franck_condon():
     st.sidebar.title("Parameters")
     displacement = st.sidebar.slider("Displacement between ground and excited state potential (Δx)", 0.0, 2.0, 0.5, 0.1)
+    frequency_ratio = st.sidebar.slider("Excited / ground vibrational frequency (ωe / ωg)", 0.5, 2.0, 1.0, 0.05)
     n_vib_ground = st.sidebar.slider("Number of vibrational levels in the ground state", 1, 10, 3)
     n_vib_excited = st.sidebar.slider("Number of vibrational levels in the excited state", 1, 10, 3)
+    kT = st.sidebar.slider("Temperature kT (in units of ħωg)", 0.0, 3.0, 0.0, 0.1)
 
     st.title("Franck-Condon Principle and Electronic Transitions")
+    st.caption("Units with ħ = m = ωg = 1.")
 
     # Harmonic oscillator potential function
     def harmonic_potential(x, k):
         return 0.5 * k * x**2
 
-    # Vibrational wavefunction (harmonic oscillator)
-    def harmonic_wavefunction(n, x, k, m):
-        normalization = (1 / np.sqrt(2**n * factorial(n))) * (m * k / (pi * hbar))**0.25
-        hermite_polynomial = np.polynomial.hermite.hermval(np.sqrt(m * k / hbar) * x, [0]*n + [1])
-        return normalization * hermite_polynomial * np.exp(-0.5 * m * k * x**2 / hbar)
-
     # Parameters for the plot
-    x = np.linspace(-3, 3, 1000)
-    k_ground = 1  # Arbitrary units for the force constant
     m = 1  # Mass (in arbitrary units)
-    k_excited = 1  # Assume similar force constant for the excited state
+    omega_ground = 1.0
+    omega_excited = frequency_ratio * omega_ground
+    k_ground = m * omega_ground**2
+    k_excited = m * omega_excited**2
+
+    # Span both wells out past the classical turning point of their highest level
+    reach_ground = np.sqrt((2 * n_vib_ground + 1) / (m * omega_ground)) + 1
+    reach_excited = np.sqrt((2 * n_vib_excited + 1) / (m * omega_excited)) + 1
+    x = np.linspace(min(-reach_ground, displacement - reach_excited),
+                    max(reach_ground, displacement + reach_excited), 1000)
 
     # Calculate potentials
     V_ground = harmonic_potential(x, k_ground)
     V_excited = harmonic_potential(x - displacement, k_excited)
 
-    # Plot the potential energy curves
-    plt.figure(figsize=(10, 6))
-    plt.plot(x, V_ground, label='Ground State Potential', color='blue')
-    plt.plot(x, V_excited, label='Excited State Potential', color='red')
+    # Vibrational wavefunctions and the whole Franck-Condon matrix, computed once
+    psi_ground = oscillator_engine.eigenstates_on(x, m, omega_ground, n_vib_ground)
+    psi_excited = oscillator_engine.eigenstates_on(x - displacement, m, omega_excited, n_vib_excited)
+    E_ground = oscillator_engine.energy_levels(n_vib_ground, omega_ground)
+    E_excited = oscillator_engine.energy_levels(n_vib_excited, omega_excited)
+    fc_factors = vibronic.franck_condon_factors(n_vib_ground, n_vib_excited, displacement,
+                                                omega_ground, omega_excited, m)
+
+    # Explicit figures: two charts on one page must not share pyplot's current figure
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.plot(x, V_ground, label='Ground State Potential', color='blue')
+    ax.plot(x, V_excited, label='Excited State Potential', color='red')
 
     # Plot the vibrational levels and wavefunctions
     for n in range(n_vib_ground):
-        E_n = (n + 0.5) * hbar * np.sqrt(k_ground / m)
-        psi_n = harmonic_wavefunction(n, x, k_ground, m) + E_n
-        plt.plot(x, psi_n, color='blue', alpha=0.6)
-        plt.hlines(E_n, -3, 3, colors='blue', linestyles='--', alpha=0.5)
+        ax.plot(x, psi_ground[n] + E_ground[n], color='blue', alpha=0.6)
+        ax.hlines(E_ground[n], x[0], x[-1], colors='blue', linestyles='--', alpha=0.5)
 
     for n in range(n_vib_excited):
-        E_n_excited = (n + 0.5) * hbar * np.sqrt(k_excited / m)
-        psi_n_excited = harmonic_wavefunction(n, x - displacement, k_excited, m) + E_n_excited
-        plt.plot(x, psi_n_excited, color='red', alpha=0.6)
-        plt.hlines(E_n_excited, -3, 3, colors='red', linestyles='--', alpha=0.5)
-
-        # Calculate Franck-Condon factors (integral of the overlap between wavefunctions)
-        fc_factors = []
-        for m_level in range(n_vib_ground):
-            psi_m_ground = harmonic_wavefunction(m_level, x, k_ground, m)
-            overlap = simps(psi_n_excited * psi_m_ground, x)
-            fc_factors.append(overlap**2)
-
-        # Visualize the transitions based on Franck-Condon factors
-        for m_level, fc_factor in enumerate(fc_factors):
-            if fc_factor > 0.01:  # Only show significant overlaps
-                E_m_ground = (m_level + 0.5) * hbar * np.sqrt(k_ground / m)
-                plt.plot([x[np.argmax(psi_n_excited)], x[np.argmax(harmonic_wavefunction(m_level, x, k_ground, m))]], 
-                         [E_n_excited, E_m_ground], color='green', alpha=fc_factor, linewidth=2*fc_factor)
-
-    plt.title("Franck-Condon Principle: Electronic Transitions in a Molecule")
-    plt.xlabel("Position (x)")
-    plt.ylabel("Energy")
-    plt.legend()
-    plt.grid(True)
-    st.pyplot(plt)
+        ax.plot(x, psi_excited[n] + E_excited[n], color='red', alpha=0.6)
+        ax.hlines(E_excited[n], x[0], x[-1], colors='red', linestyles='--', alpha=0.5)
+
+    # Visualize the transitions based on Franck-Condon factors
+    for m_level, n in zip(*np.nonzero(fc_factors > 0.01)):  # Only show significant overlaps
+        fc_factor = fc_factors[m_level, n]
+        ax.plot([x[np.argmax(psi_excited[n])], x[np.argmax(psi_ground[m_level])]],
+                [E_excited[n], E_ground[m_level]], color='green', alpha=fc_factor, linewidth=2*fc_factor)
+
+    # Keep the potentials from stretching the energy axis far above the highest level
+    ax.set_ylim(-0.2, max(E_ground[-1], E_excited[-1]) + 1.5)
+    ax.set_title("Franck-Condon Principle: Electronic Transitions in a Molecule")
+    ax.set_xlabel("Position (x)")
+    ax.set_ylabel("Energy")
+    ax.legend()
+    ax.grid(True)
+    st.pyplot(fig)
+    plt.close(fig)
+
+    # Absorption progression from the thermally populated ground levels
+    lines, intensities = vibronic.progression(40, 60, displacement, omega_ground, omega_excited, kT)
+    energy_axis = np.linspace(lines.min(), lines.max(), 2000)
+    shown = intensities > 1e-4 * intensities.max()
+
+    fig, ax = plt.subplots(figsize=(10, 4))
+    ax.vlines(lines[shown], 0, intensities[shown], color='green', alpha=0.6, label='Transitions')
+    ax.plot(energy_axis, vibronic.broaden(lines, intensities, energy_axis, 0.05), color='black',
+            label='Broadened spectrum')
+    ax.set_xlim(lines[shown].min() - 0.5, lines[shown].max() + 0.5)
+    ax.set_title("Vibronic Absorption Spectrum")
+    ax.set_xlabel("Transition energy relative to the electronic origin")
+    ax.set_ylabel("Intensity")
+    ax.legend()
+    ax.grid(True)
+    st.pyplot(fig)
+    plt.close(fig)
 
 def main():
     st.sidebar.title("Quantum Chemistry Visualizations")
@@ -0,0 +1,217 @@
+import functools
+import math
+import time
+import warnings
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.linalg import eigh_tridiagonal
+from scipy.sparse.linalg import LinearOperator, eigsh, lobpcg
+
+
+def kinetic_1d(n, dx, m=1.0, hbar=1.0):
+    """Sparse -hbar^2/(2m) d^2/dx^2 on n interior points with hard walls just outside them."""
+    t = hbar**2 / (2 * m * dx**2)
+    return sp.diags([np.full(n - 1, -t), np.full(n, 2 * t), np.full(n - 1, -t)], [-1, 0, 1], format='csr')
+
+
+def grid(bounds, n_points):
+    """Interior grid axes and spacings for hard walls at bounds = [(lo, hi), ...] per dimension."""
+    if np.ndim(n_points) == 0:
+        n_points = [n_points] * len(bounds)
+    axes = [np.linspace(lo, hi, n + 2)[1:-1] for (lo, hi), n in zip(bounds, n_points)]
+    spacings = [(hi - lo) / (n + 1) for (lo, hi), n in zip(bounds, n_points)]
+    return axes, spacings
+
+
+class GridHamiltonian:
+    """H = -hbar^2/(2m) laplacian + V on a regular 2D or 3D grid, as a sparse Kronecker sum.
+
+    V holds the potential on the interior points (meshgrid 'ij' order). The kinetic part is
+    sum_i I x ... x T_i x ... x I with the 1D operators T_i of kinetic_1d, so the matrix has
+    2d + 1 diagonals and is never formed densely.
+
+    The separable part of the problem, H0 = sum_i (T_i + v_i) with v_i the potential along the
+    grid lines through its minimum, is diagonalized exactly from its 1D factors. H0 supplies the
+    starting vectors (its lowest product states) and the preconditioner (H0 - E0 + gap)^-1, so
+    separable potentials converge almost at once and mildly coupled ones in a few iterations.
+    """
+
+    def __init__(self, V, spacings, m=1.0, hbar=1.0):
+        self.V = np.asarray(V, dtype=float)
+        self.shape = self.V.shape
+        self.spacings = tuple(spacings)
+        self.m = m
+        self.hbar = hbar
+        self.size = self.V.size
+        self.volume_element = math.prod(self.spacings)
+        self._matrix = None
+        self._separable = None
+
+    def matrix(self):
+        """The Hamiltonian as a CSR matrix, built on first use."""
+        if self._matrix is None:
+            H = sp.diags(self.V.ravel())
+            for axis, (n, dx) in enumerate(zip(self.shape, self.spacings)):
+                before = sp.identity(math.prod(self.shape[:axis]), format='csr')
+                after = sp.identity(math.prod(self.shape[axis + 1:]), format='csr')
+                H = H + sp.kron(sp.kron(before, kinetic_1d(n, dx, self.m, self.hbar)), after)
+            self._matrix = H.tocsr()
+        return self._matrix
+
+    def separable(self):
+        """1D eigenbases [(levels, vectors), ...] of H0 and the sum of levels on the full grid."""
+        if self._separable is None:
+            centre = np.unravel_index(np.argmin(self.V), self.shape)
+            V_min = self.V[centre]
+            bases, total = [], 0
+            for axis, (n, dx) in enumerate(zip(self.shape, self.spacings)):
+                line = list(centre)
+                line[axis] = slice(None)
+                # Each axis keeps V_min once; the others subtract it so H0 matches V on those lines
+                v = self.V[tuple(line)] - V_min * (axis > 0)
+                t = self.hbar**2 / (2 * self.m * dx**2)
+                levels, vectors = eigh_tridiagonal(2 * t + v, np.full(n - 1, -t))
+                bases.append((levels, vectors))
+                total = np.add.outer(total, levels) if axis else levels
+            self._separable = bases, total
+        return self._separable
+
+    def _to_modes(self, X, inverse=False):
+        """Apply the tensor product of the 1D eigenbases (or its transpose) to X of shape (k, *grid).
+
+        Each axis is one matrix product: a single GEMM for the last axis and a batched one for
+        the others, so no transposed copies of X are made.
+        """
+        k = X.shape[0]
+        for axis, (levels, vectors) in enumerate(self.separable()[0]):
+            basis = vectors if inverse else vectors.T
+            n = self.shape[axis]
+            if axis == len(self.shape) - 1:
+                X = X.reshape(-1, n) @ basis.T
+            else:
+                X = np.matmul(basis, X.reshape(k * math.prod(self.shape[:axis]), n, -1))
+        return X.reshape((k,) + self.shape)
+
+    def preconditioner(self, n_states):
+        """(H0 - E0 + gap)^-1 applied matrix-free in the separable eigenbasis."""
+        total = self.separable()[1]
+        lowest = np.partition(total.ravel(), n_states)[:n_states + 1]
+        denominator = total - lowest.min() + (lowest.max() - lowest.min()) / n_states
+
+        def apply(X):
+            X = np.asarray(X).reshape(self.size, -1).T.reshape((-1,) + self.shape)
+            modes = self._to_modes(X) / denominator
+            return self._to_modes(modes, inverse=True).reshape(-1, self.size).T
+
+        return LinearOperator((self.size, self.size), matvec=apply, matmat=apply, dtype=float)
+
+    def separable_guess(self, n_states):
+        """The n_states lowest product eigenstates of H0, as columns of shape (size, n_states)."""
+        bases, total = self.separable()
+        chosen = np.argsort(total.ravel(), kind='stable')[:n_states]
+        columns = []
+        for index in np.column_stack(np.unravel_index(chosen, self.shape)):
+            factors = [vectors[:, k] for (levels, vectors), k in zip(bases, index)]
+            columns.append(functools.reduce(np.multiply.outer, factors).ravel())
+        return np.column_stack(columns)
+
+    def lowest(self, n_states, guess=None, method='lobpcg', tol=None, maxiter=200):
+        """Lowest n_states (energies, psi) with psi of shape (n_states, *grid shape).
+
+        psi is normalized so that sum(psi**2) * dV = 1. With method='lobpcg', `guess` (for
+        example the psi of a previous, nearby parameter set) warm-starts the iteration instead
+        of the separable product states; a warm start that does not converge, as one from a
+        distant parameter set may not, is repeated cold. method='eigsh' uses ARPACK in
+        shift-invert mode around the potential minimum; its sparse LU is cheap in 2D but costly
+        on large 3D grids.
+        """
+        if method == 'eigsh':
+            energies, vectors = eigsh(self.matrix(), k=n_states, sigma=float(self.V.min()), which='LM',
+                                      tol=tol or 0)
+        else:
+            # A few guard vectors beyond n_states keep the top of the wanted block converging
+            block = n_states + max(2, n_states // 4)
+            X = self.separable_guess(block)
+            warm = guess is not None and np.shape(guess) == (n_states,) + self.shape
+            if warm:
+                X[:, :n_states] = np.reshape(guess, (n_states, self.size)).T
+            if tol is None:
+                # Residuals relative to the energy scale of the block, so any units work
+                tol = 1e-5 * np.abs(np.partition(self.separable()[1].ravel(), block)[:block + 1]).max()
+            with warnings.catch_warnings():
+                if warm:  # convergence is checked below instead
+                    warnings.simplefilter('ignore', UserWarning)
+                energies, vectors = lobpcg(self.matrix(), X, M=self.preconditioner(block), largest=False,
+                                           tol=tol, maxiter=maxiter)
+            if warm:
+                order = np.argsort(energies)[:n_states]
+                residuals = self.matrix() @ vectors[:, order] - vectors[:, order] * energies[order]
+                if np.linalg.norm(residuals, axis=0).max() > tol:
+                    # Stalled on a mix of the wrong states; the separable start does not
+                    return self.lowest(n_states, None, method, tol, maxiter)
+        order = np.argsort(energies)[:n_states]
+        psi = vectors[:, order].T.reshape((n_states,) + self.shape) / math.sqrt(self.volume_element)
+        return energies[order], psi
+
+
+def solve(potential, bounds, n_points, n_states=10, m=1.0, hbar=1.0, guess=None, method='lobpcg'):
+    """Lowest n_states (energies, axes, psi) of a particle in potential(*meshgrid) inside a box.
+
+    `potential` takes the 'ij' meshgrid arrays of the interior points and returns V on them;
+    the walls at `bounds` are hard. See GridHamiltonian.lowest for `guess` and `method`.
+    """
+    axes, spacings = grid(bounds, n_points)
+    V = np.broadcast_to(potential(*np.meshgrid(*axes, indexing='ij')), tuple(len(a) for a in axes))
+    energies, psi = GridHamiltonian(V, spacings, m, hbar).lowest(n_states, guess, method)
+    return energies, axes, psi
+
+
+def _oscillator_levels(frequencies, n_states):
+    """Lowest n_states of sum_i omega_i (n_i + 1/2)."""
+    quanta = np.indices((n_states,) * len(frequencies)).reshape(len(frequencies), -1)
+    return np.sort(np.dot(frequencies, quanta + 0.5))[:n_states]
+
+
+def benchmark(n_states=10, coupling=0.3):
+    """Accuracy and timing of the solver against analytic spectra on 128^2 and 64^3 grids.
+
+    Cases: the separable oscillator and box, and an oscillator with a bilinear coupling
+    coupling * x * y, which is not separable on the grid but has the normal-mode frequencies
+    sqrt(1 +- coupling). The coupled case is solved cold and then warm-started after a 5%
+    change of the coupling, as happens when a slider moves. Returns rows of
+    (case, method, seconds, max |dE/E| against the analytic energies).
+    """
+    rows = []
+
+    def timed(label, method, exact, *args, **kwargs):
+        start = time.perf_counter()
+        energies, axes, psi = solve(*args, method=method, **kwargs)
+        rows.append((label, method, time.perf_counter() - start, np.max(np.abs(energies / exact - 1))))
+        return psi
+
+    for dims, n in ((2, 128), (3, 64)):
+        size = f"{n}^{dims}"
+        bounds = [(-8.0, 8.0)] * dims
+        timed(f"oscillator {size}", 'lobpcg', _oscillator_levels([1.0] * dims, n_states),
+              lambda *X: 0.5 * sum(x**2 for x in X), bounds, n, n_states)
+
+        quanta = np.indices((n_states + 1,) * dims).reshape(dims, -1) + 1
+        exact = np.sort(np.pi**2 / 2 * np.sum(quanta**2, axis=0))[:n_states]
+        # Shift-invert needs a sparse LU, which is only affordable in 2D
+        for method in ('lobpcg', 'eigsh') if dims == 2 else ('lobpcg',):
+            timed(f"box {size}", method, exact, lambda *X: 0.0, [(0.0, 1.0)] * dims, n, n_states)
+
+        psi = None
+        for c in (coupling, 1.05 * coupling):
+            frequencies = [math.sqrt(1 - c), math.sqrt(1 + c)] + [1.0] * (dims - 2)
+            label = f"coupled oscillator {size}" + (" warm" if psi is not None else "")
+            psi = timed(label, 'lobpcg', _oscillator_levels(frequencies, n_states),
+                        lambda *X: 0.5 * sum(x**2 for x in X) + c * X[0] * X[1], bounds, n, n_states,
+                        guess=psi)
+    return rows
+
+
+if __name__ == "__main__":
+    for case, method, seconds, error in benchmark():
+        print(f"{case:<32s} {method:<7s} {seconds:8.3f} s   max |dE/E| = {error:.2e}")
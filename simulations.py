@@ -0,0 +1,566 @@
+from functools import lru_cache
+
+import numpy as np
+
+# Headless core of the main_app pages: each page is a compute function (parameters -> dict of
+# arrays and labels, no Streamlit) and a figure builder. Matplotlib builders draw into a
+# figure_cache.PageFigure so Streamlit sessions can update artists in place; Plotly builders
+# return a go.Figure. main_app wraps these in widgets and batch_render sweeps them offline.
+#
+# name -> dict(compute=, build=, kind='matplotlib' | 'plotly', figsize=, valid=)
+PAGES = {}
+
+
+def register(name, compute, build, kind, figsize=None, valid=None):
+    """Add a page; `valid(params)` rejects parameter combinations the page cannot show."""
+    PAGES[name] = dict(compute=compute, build=build, kind=kind, figsize=figsize, valid=valid)
+
+
+# Browser mode of the discrete pages: every state goes out once as a Plotly frame, and a
+# slider switches frames in plotly.js without a Streamlit rerun. Base64 bytes of array data
+# shared by all the frames of one figure:
+FRAMES_BUDGET = 512 * 1024
+
+
+def state_slider(fig, names, prefix):
+    """Add a slider over the frames `names` of fig that swaps them client-side, with no rerun."""
+    fig.update_layout(sliders=[dict(
+        active=0,
+        currentvalue=dict(prefix=prefix, font=dict(size=14)),
+        font=dict(color='rgba(0, 0, 0, 0)'),  # too many steps for tick labels; the current value names the state
+        pad=dict(t=10),
+        steps=[dict(label=name, method='animate',
+                    args=[[name], dict(mode='immediate', frame=dict(duration=0, redraw=True),
+                                       transition=dict(duration=0))])
+               for name in names],
+    )])
+    return fig
+
+
+# Harmonic oscillator
+
+def harmonic_oscillator(m=1.0, omega=1.0, n_levels=5, hbar=1.0):
+    """Potential, energies and the n_levels lowest wavefunctions on x in [-5, 5]."""
+    import oscillator_engine
+
+    # All wavefunctions at once from the shared, cached oscillator engine
+    x, psi = oscillator_engine.eigenstates(m, omega, n_levels, -5.0, 5.0, 1000, hbar)  # Range of x values
+    energies = oscillator_engine.energy_levels(n_levels, omega, hbar)
+    return dict(x=x, psi=psi, energies=energies, potential=0.5 * m * omega**2 * x**2,
+                y_max=(n_levels + 0.5) * hbar * omega + 1)
+
+
+def harmonic_oscillator_check(m=1.0, omega=1.0, n_levels=5, hbar=1.0):
+    """(levels checked, max |dE/E|, max |d psi|) of the analytic states against schrodinger_1d."""
+    import oscillator_engine
+    import schrodinger_1d
+
+    n_check = min(n_levels, 20)
+    x, psi = oscillator_engine.eigenstates(m, omega, n_levels, -5.0, 5.0, 1000, hbar)
+    width = np.sqrt(hbar / (m * omega)) * (np.sqrt(2 * n_check + 1) + 6)
+    solution = schrodinger_1d.solve(lambda x: 0.5 * m * omega**2 * x**2, -width, width, n_check, 4001, m, hbar)
+    dE, dpsi = schrodinger_1d.compare(x, oscillator_engine.energy_levels(n_check, omega, hbar),
+                                      psi[:n_check], solution)
+    return n_check, dE, dpsi
+
+
+def draw_harmonic_oscillator(data, page_figure):
+    x, psi, energies = data['x'], data['psi'], data['energies']
+    n_levels = len(energies)
+    artists = page_figure.artists
+
+    if page_figure.rebuild_needed(n_levels):
+        # Preparing the plot
+        ax = artists['ax'] = page_figure.fig.add_subplot()
+
+        # Plotting the potential
+        artists['potential'], = ax.plot(x, data['potential'], label="Potential", color='black')
+        ax.set_title("Potential and Wavefunctions for a Quantum Harmonic Oscillator")
+        ax.set_xlabel("Position (x)")
+        ax.set_ylabel("Energy / Amplitude")
+
+        # Plotting the energy levels and wavefunctions
+        artists['levels'] = ax.hlines(energies, x[0], x[-1], colors='grey', linestyles='--', label="Energy levels")
+        artists['waves'] = [ax.plot(x, psi[n] + energies[n], label=f"Wavefunction n={n}")[0]
+                            for n in range(n_levels)]
+        if n_levels <= 10:
+            ax.legend()
+        ax.grid(True)
+    else:
+        # Same number of levels: move the existing artists instead of redrawing
+        artists['potential'].set_data(x, data['potential'])
+        artists['levels'].set_segments([[(x[0], e), (x[-1], e)] for e in energies])
+        for n, line in enumerate(artists['waves']):
+            line.set_data(x, psi[n] + energies[n])
+
+    artists['ax'].set_ylim(0, data['y_max'])
+    return page_figure.fig
+
+
+# Particle in a box
+
+# A level needing more than MAX_SAMPLES x-points (about the figure's width in pixels) is drawn
+# as an envelope band; all drawn lines share SAMPLE_BUDGET, which also caps how many levels are
+# stroked as lines (about 88) so the PNG's raster time stays flat as levels are added
+MAX_SAMPLES = 1000
+SAMPLE_BUDGET = 16_000
+
+
+def box_wavefunction(n, x, l):
+    """Calculate the wavefunction for a given level, position, and box length."""
+    return np.sqrt(2 / l) * np.sin(n * np.pi * x / l)
+
+
+def box_energy(n, m, l):
+    """Calculate the energy level for a given level, mass, and box length (SI hbar)."""
+    from scipy.constants import hbar, pi
+    return n**2 * pi**2 * hbar**2 / (2 * m * l**2)
+
+
+def level_samples(n_levels, budget=SAMPLE_BUDGET, max_samples=MAX_SAMPLES):
+    """x-samples of levels 1..n_levels, each on its own grid; 0 marks a level drawn as a band.
+
+    Level n has n half-waves and gets at least 4n+1 samples. Low levels would like 16n+1
+    (at least 64); that surplus is thinned when the lines would exceed `budget`.
+    """
+    n = np.arange(1, n_levels + 1)
+    required = 4 * n + 1
+    lines = (required <= max_samples) & (np.cumsum(required) <= budget)
+    surplus = (np.clip(16 * n + 1, 64, max_samples) - required)[lines]
+    share = min(1.0, (budget - required[lines].sum()) / max(surplus.sum(), 1))
+    samples = np.zeros(n_levels, dtype=int)
+    samples[lines] = required[lines] + (surplus * share).astype(int)
+    return samples
+
+
+def particle_in_a_box(m=1.0, l=1.0, n_levels=5):
+    """Energies and the offset, display-scaled wavefunctions and densities of the lowest n_levels.
+
+    x, psi_offset and density_offset are the grids of the levels drawn as lines, one after the
+    other with level_samples[i] points each; levels with level_samples 0 are drawn as bands of
+    half-height `scale` around their energy.
+    """
+    n = np.arange(1, n_levels + 1)
+    energies = box_energy(n, m, l)
+    scale = energies / 10  # Adjust scaling factor as needed
+
+    samples = level_samples(n_levels)
+    drawn = samples > 0
+    # A line with fewer than 2 samples per half-wave aliases into a moire of the wrong state
+    if np.any(samples[drawn] < 2 * n[drawn] + 1):
+        raise ValueError("level_samples left a drawn level under-resolved")
+
+    # Every drawn level's samples in one array: its quantum number and position across the box
+    counts = samples[drawn]
+    starts = np.cumsum(counts) - counts
+    fraction = (np.arange(counts.sum()) - np.repeat(starts, counts)) / np.repeat(counts - 1, counts)
+    # Unit-amplitude wavefunctions, scaled and offset to their energy level
+    psi = np.sin(np.repeat(n[drawn], counts) * np.pi * fraction)
+    energy, height = np.repeat(energies[drawn], counts), np.repeat(scale[drawn], counts)
+    return dict(l=l, x=fraction * l, energies=energies, scale=scale, level_samples=samples,
+                psi_offset=psi * height + energy, density_offset=psi**2 * height + energy)
+
+
+def particle_in_a_box_check(m=1.0, l=1.0, n_levels=5):
+    """(levels checked, max |dE/E|, max |d psi|) of the analytic states against schrodinger_1d."""
+    from scipy.constants import hbar
+    import schrodinger_1d
+
+    n_check = min(n_levels, 20)
+    x = np.linspace(0, l, 1000)
+    n = np.arange(1, n_check + 1)
+    solution = schrodinger_1d.solve(lambda x: 0.0, 0, l, n_check, 4001, m, hbar)
+    dE, dpsi = schrodinger_1d.compare(x, box_energy(n, m, l), box_wavefunction(n[:, None], x, l), solution)
+    return n_check, dE, dpsi
+
+
+def draw_particle_in_a_box(data, page_figure):
+    import matplotlib
+    from matplotlib.collections import LineCollection, PolyCollection
+
+    l, energies, scale = data['l'], data['energies'], data['scale']
+    samples = data['level_samples']
+    n_levels, n_lines = len(energies), np.count_nonzero(samples)
+    counts = samples[:n_lines]
+    starts = np.cumsum(counts) - counts
+
+    x = data['x']
+    waves = np.split(np.column_stack([x, data['psi_offset']]), starts[1:])
+    # Close each density curve down to its energy at both walls: insert the wall points for all
+    # levels at once (end points sort before the next level's start point at the same index)
+    corners = np.r_[starts + counts, starts]
+    fill_x = np.insert(x, corners, np.r_[np.full(n_lines, l), np.zeros(n_lines)])
+    fill_y = np.insert(data['density_offset'], corners, np.r_[energies[:n_lines], energies[:n_lines]])
+    fills = np.split(np.column_stack([fill_x, fill_y]), (starts + 2 * np.arange(n_lines))[1:])
+    # Levels with more half-waves than pixels across: the ±amplitude envelope and the density band
+    energy, height = energies[n_lines:, None], scale[n_lines:, None]
+    zero, wall = np.zeros_like(energy), np.full_like(energy, l)
+    bands = np.hstack([zero, energy - height, wall, energy - height, wall, energy + height, zero,
+                       energy + height]).reshape(-1, 4, 2)
+    fills += list(np.hstack([zero, energy, wall, energy, wall, energy + height, zero,
+                             energy + height]).reshape(-1, 4, 2))
+    level_segments = np.stack([np.zeros(n_levels), energies, np.full(n_levels, l), energies], axis=-1).reshape(-1, 2, 2)
+
+    artists = page_figure.artists
+    if page_figure.rebuild_needed(n_levels):
+        # Plotting code
+        ax1 = artists['ax'] = page_figure.fig.add_subplot()
+
+        # Only one axis is needed since we're aligning everything according to energy levels
+        ax1.set_xlabel('Position (x)')
+        ax1.set_ylabel('Energy / Wave Amplitude')
+        ax1.grid(True)
+
+        # One collection per kind of artist, however many levels there are
+        colors = matplotlib.colormaps['viridis'](np.linspace(0, 1, n_levels))
+        linewidth = 1.5 if n_levels <= 50 else 0.5
+        artists['levels'] = ax1.add_collection(LineCollection(level_segments, colors='gray',
+                                                              linestyles='dashed', linewidths=linewidth))
+        artists['waves'] = ax1.add_collection(LineCollection(waves, colors=colors[:n_lines], linewidths=linewidth))
+        artists['bands'] = ax1.add_collection(PolyCollection(bands, facecolors=colors[n_lines:], edgecolors='none',
+                                                             alpha=0.6))
+        artists['fills'] = ax1.add_collection(PolyCollection(fills, facecolors=colors, edgecolors='none',
+                                                             alpha=0.3))
+    else:
+        # Same number of levels: update the existing collections in place
+        artists['levels'].set_segments(level_segments)
+        artists['waves'].set_segments(waves)
+        artists['bands'].set_verts(bands)
+        artists['fills'].set_verts(fills)
+
+    ax1 = artists['ax']
+    y_min = (energies - scale).min()
+    y_max = (energies + scale).max()
+    ax1.set_xlim(-0.05 * l, 1.05 * l)
+    ax1.set_ylim(y_min - 0.05 * (y_max - y_min), y_max + 0.05 * (y_max - y_min))
+    page_figure.fig.tight_layout()
+    return page_figure.fig
+
+
+# Particle in a 2D box
+
+BOX_2D_MODES = ('Quantum numbers', 'Energy order', 'Numerical, with a central bump')
+
+
+def particle_in_a_box_2d(m=1.0, Lx=1.0, Ly=1.0, select_by='Quantum numbers', nx=1, ny=1, k=1,
+                         height=10.0, width=0.15, guess=None):
+    """Surface data (x, y, psi in meshgrid(x, y) order) of one 2D box state and its description.
+
+    select_by picks the state by (nx, ny), by its position k in energy order, or as the k-th
+    numerical state with a Gaussian bump of `height` ground-state energies and relative
+    `width` in the middle; `guess` warm-starts that solver. Also returns `info` (a one-line
+    summary), `table` (levels around state k, energy order only), `states` (numerical only) and
+    `warning` (set when the grid cannot resolve the state).
+    """
+    from scipy.constants import hbar
+    import box_states
+
+    result = dict(info=None, table=None, states=None, quantum_numbers=None, warning=None)
+    if select_by == 'Energy order':
+        # List a few states past k so the degeneracy of state k is complete
+        energies, states = box_states.lowest_states(k + 64, (Lx, Ly), m, hbar)
+        nx, ny = (int(n) for n in states[k - 1])
+        groups = box_states.degeneracy_groups(energies)
+        level = next(i for i, (start, stop) in enumerate(groups) if start < k <= stop)
+        result['info'] = (f"State {k}: nx={nx}, ny={ny}, E = {energies[k - 1]:.4e} J, "
+                          f"degeneracy {groups[level][1] - groups[level][0]}")
+        result['table'] = [{'level': i + 1,
+                            'E (J)': f"{energies[start]:.4e}",
+                            'degeneracy': stop - start,
+                            '(nx, ny)': ', '.join(f"({a}, {b})" for a, b in states[start:stop])}
+                           for i, (start, stop) in enumerate(groups[:-1])
+                           if abs(i - level) <= 10]
+    elif select_by == 'Numerical, with a central bump':
+        import schrodinger_nd
+
+        E_11 = box_states.energy((1, 1), (Lx, Ly), m, hbar)
+        sigma = width * min(Lx, Ly)
+
+        def potential(X, Y):
+            return height * E_11 * np.exp(-((X - Lx / 2)**2 + (Y - Ly / 2)**2) / (2 * sigma**2))
+
+        # Sparse solver, optionally warm-started from the states of a nearby parameter set
+        energies, (x, y), states = schrodinger_nd.solve(potential, [(0, Lx), (0, Ly)], 96, 10, m, hbar,
+                                                       guess=guess)
+        result.update(x=x, y=y, psi=states[k - 1].T, states=states,  # meshgrid(x, y) order
+                      title=f'Numerical state {k} with a central bump',
+                      info=f"State {k}: E = {energies[k - 1]:.4e} J = {energies[k - 1] / E_11:.3f} E₁₁")
+        return result
+
+    # Wavefunction as an outer product of cached 1D sine tables, with >= 4 points per half-wave
+    # on each axis; the surface's level of detail thins it again for the browser
+    n_points = [box_states.grid_points(n) for n in (nx, ny)]
+    (x, y), psi = box_states.wavefunction((nx, ny), (Lx, Ly), n_points)
+    if max(nx, ny) > (box_states.MAX_GRID_POINTS - 1) // 4:
+        result['warning'] = (f"nx={nx}, ny={ny} has too many half-waves for the {box_states.MAX_GRID_POINTS}-point "
+                             "grid; the surface is under-resolved and may show a moire pattern")
+    result.update(x=x, y=y, psi=psi, quantum_numbers=np.array([nx, ny]),
+                  title=f'Wavefunction for nx={nx}, ny={ny}')
+    return result
+
+
+def surface_particle_in_a_box_2d(data, budget=None):
+    import plotly.graph_objects as go
+    import figure_encoding
+
+    # 1D axes and float32, thinned to the byte budget but kept at >= 3 points per half-wave
+    min_shape = None
+    if data.get('quantum_numbers') is not None:
+        nx, ny = data['quantum_numbers']
+        min_shape = (3 * ny + 1, 3 * nx + 1)
+    surface = figure_encoding.surface(data['psi'], data['x'], data['y'], budget or figure_encoding.SURFACE_BUDGET,
+                                      min_shape=min_shape, colorscale='Viridis')
+    fig = go.Figure(data=[surface])
+    fig.update_layout(title=data['title'], autosize=True,
+                      scene=dict(
+                          xaxis_title='X',
+                          yaxis_title='Y',
+                          zaxis_title='Wave Amplitude',
+                          aspectratio=dict(x=1, y=1, z=0.5)),
+                      )
+    return fig
+
+
+@lru_cache(maxsize=4)
+def particle_in_a_box_2d_frames(Lx=1.0, Ly=1.0, n_max=10, budget=FRAMES_BUDGET):
+    """Every (nx, ny) state up to n_max as frames of one surface figure, with a state slider.
+
+    All states share one grid, so the x and y axes are sent once and each frame carries only
+    its float32 amplitudes, thinned together to `budget` but kept at >= 3 points per
+    half-wave of n_max. The figure is cached and shared: do not modify it.
+    """
+    import plotly.graph_objects as go
+    import box_states
+    import figure_encoding
+
+    states = [(nx, ny) for nx in range(1, n_max + 1) for ny in range(1, n_max + 1)]
+    n_points = box_states.grid_points(n_max)
+    (x, y), psi = box_states.wavefunction(states[0], (Lx, Ly), n_points)
+    rows, columns = figure_encoding.level_of_detail(psi.shape, len(states), budget,
+                                                    min_shape=(3 * n_max + 1, 3 * n_max + 1))
+    grid = np.ix_(rows, columns)
+
+    frames = []
+    for nx, ny in states:
+        psi = box_states.wavefunction((nx, ny), (Lx, Ly), n_points)[1]
+        frames.append(go.Frame(name=f'{nx}, {ny}', data=[go.Surface(z=figure_encoding.typed_array(psi[grid]))],
+                               layout=dict(title=f'Wavefunction for nx={nx}, ny={ny}')))
+    amplitude = 2 / np.sqrt(Lx * Ly)  # largest |psi| of any state
+    fig = go.Figure(data=[go.Surface(z=frames[0].data[0].z, x=figure_encoding.typed_array(x[columns]),
+                                     y=figure_encoding.typed_array(y[rows]), colorscale='Viridis',
+                                     cmin=-amplitude, cmax=amplitude)],
+                    frames=frames)
+    fig.update_layout(title=frames[0].layout.title.text, autosize=True,
+                      scene=dict(
+                          xaxis_title='X',
+                          yaxis_title='Y',
+                          zaxis_title='Wave Amplitude',
+                          zaxis=dict(range=[-amplitude, amplitude]),
+                          aspectratio=dict(x=1, y=1, z=0.5)),
+                      )
+    return state_slider(fig, [frame.name for frame in frames], 'nx, ny = ')
+
+
+# Two hydrogen atoms
+
+A0 = 1.0  # Bohr radius in arbitrary units
+
+
+def psi_1s(r):
+    """Calculate the wavefunction of 1s orbital."""
+    return (np.pi**-0.5) * np.exp(-r/A0)
+
+
+def hydrogen_orbitals(R=2.0, phase='In-Phase', resolution=50, molecule=None, precomputed=None):
+    """Density of two hydrogen atoms R apart on a resolution^3 grid over [-5, 5]^3.
+
+    With molecule=None the density is the sum (In-Phase) or |difference| (Out-of-Phase) of the
+    atomic 1s densities, sliced from the precomputed separation sweep when `precomputed`
+    (default: if resolution is one of h2_density_stack.STACK_RESOLUTIONS). With molecule='H2'
+    or 'HeH+' it is the bonding or antibonding STO-3G Hartree-Fock orbital density, and the
+    dissociation curve is included.
+    """
+    x = np.linspace(-5, 5, resolution)
+    if precomputed is None:
+        import h2_density_stack
+        precomputed = resolution in h2_density_stack.STACK_RESOLUTIONS
+    result = dict(x=x, phase=phase, molecule=molecule)
+
+    if molecule is not None:
+        import rhf
+
+        # Self-consistent STO-3G molecular orbital: bonding (In-Phase) or antibonding sigma
+        Psi = rhf.orbital_density(molecule, R, x, orbital=0 if phase == 'In-Phase' else 1)
+        R_values, energies, seconds = rhf.dissociation_curve(molecule)
+        energy, orbital_energies = rhf.solve(molecule, R)[:2]
+        result.update(R_values=R_values, curve=energies, curve_seconds=seconds, energy=energy,
+                      orbital_energies=orbital_energies)
+    elif precomputed:
+        import h2_density_stack
+
+        # Slice the memory-mapped separation sweep instead of recomputing the distance fields
+        Psi = h2_density_stack.get_stack(resolution).density(R, phase)
+    else:
+        X, Y, Z = np.meshgrid(x, x, x, indexing='ij')
+
+        # Positions of the two hydrogen atoms
+        R1 = np.sqrt((X + R/2)**2 + Y**2 + Z**2)  # Hydrogen 1
+        R2 = np.sqrt((X - R/2)**2 + Y**2 + Z**2)  # Hydrogen 2
+
+        # Calculate wavefunction for both atoms
+        if phase == 'In-Phase':
+            Psi = psi_1s(R1)**2 + psi_1s(R2)**2
+        else:  # Out-of-Phase
+            Psi = np.abs(psi_1s(R1)**2 - psi_1s(R2)**2)  # Absolute value to visualize the density
+    result.update(R=R, Psi=Psi)
+    return result
+
+
+def surface_hydrogen_orbitals(data, mode='Server mesh', step_size=1):
+    import plotly.graph_objects as go
+    import isosurface_mesh
+
+    x = y = z = data['x']
+    Psi = data['Psi']
+
+    # Visualization threshold for the isosurface
+    threshold = Psi.max()/10  # Adjust if needed for clearer visualization
+
+    if mode == 'Server mesh':
+        # Extract the triangles here and ship a compact float32/int32 Mesh3d
+        levels = np.linspace(threshold, Psi.max(), 3)[:-1]
+        fig = isosurface_mesh.mesh_figure(Psi, x, y, z, levels, step_size=step_size)
+        fig.update_layout(margin=dict(l=0, r=0, b=0, t=0), scene=dict(aspectmode='cube'))
+        return fig
+
+    # Create a 3D isosurface plot (the browser does the marching)
+    X, Y, Z = np.meshgrid(x, y, z, indexing='ij')
+    fig = go.Figure(data=go.Isosurface(
+        x=X.flatten(),
+        y=Y.flatten(),
+        z=Z.flatten(),
+        value=Psi.flatten(),
+        isomin=threshold,
+        isomax=Psi.max(),
+        surface=dict(count=3, fill=0.7),  # Adjust for surface detail and transparency
+        caps=dict(x_show=False, y_show=False, z_show=False),
+        colorscale='Blues',
+        opacity=0.6  # Adjust for desired transparency
+    ))
+
+    # Update plot layout
+    fig.update_layout(margin=dict(l=0, r=0, b=0, t=0), scene=dict(aspectmode='cube'))
+    return fig
+
+
+def dissociation_curve_figure(data):
+    import plotly.graph_objects as go
+
+    fig = go.Figure(go.Scatter(x=data['R_values'], y=data['curve'], mode='lines', name='RHF/STO-3G'))
+    fig.add_trace(go.Scatter(x=[data['R']], y=[data['energy']], mode='markers', marker=dict(size=10),
+                             name='Current separation'))
+    # The curve climbs to several hartree at the shortest R: show 1 hartree above the minimum,
+    # widened to the marker when the slider is there
+    low, high = data['curve'].min(), max(data['energy'], data['curve'].min() + 1.0)
+    fig.update_layout(xaxis_title='R (bohr)', yaxis_title='Total energy (hartree)',
+                      yaxis_range=[low - 0.05 * (high - low), high + 0.05 * (high - low)],
+                      margin=dict(l=0, r=0, b=0, t=30), title=f"{data['molecule']} dissociation curve")
+    return fig
+
+
+# Rigid rotor
+
+L_MAX = 20  # Highest l offered by the slider
+
+
+def rigid_rotor(l=0, m=0):
+    """Polar surface r = |Y_lm| in Cartesian coordinates, from the shared spherical-harmonic table."""
+    import spherical_harmonics
+
+    # Ensure m is within the valid range
+    m = max(-l, min(l, m))
+
+    # Shared angle grid with every Y_lm up to L_MAX, computed once per process
+    Y_table = spherical_harmonics.table(L_MAX, 50, 100)
+    phi, theta = np.meshgrid(Y_table.polar, Y_table.azimuth, indexing='ij')
+
+    # Spherical harmonics (a table lookup rather than a special-function call)
+    Y = Y_table(l, m)
+
+    # Cartesian coordinates
+    r = np.abs(Y)
+    return dict(x=r * np.sin(phi) * np.cos(theta), y=r * np.sin(phi) * np.sin(theta), z=r * np.cos(phi),
+                axis_range=[-max(0.5, r.max()), max(0.5, r.max())],  # Keep high-l lobes in view
+                title=f'Wavefunction for l = {l}, m = {m}')
+
+
+def surface_rigid_rotor(data, budget=None):
+    import plotly.graph_objects as go
+    import figure_encoding
+
+    # Create the plot: float32 and, as |Y_lm| does not vary with the azimuth, only the
+    # azimuthal samples are thinned to fit the byte budget
+    surface = figure_encoding.surface(data['z'], data['x'], data['y'], budget or figure_encoding.SURFACE_BUDGET,
+                                      axes=(1,), colorscale='Viridis')
+    fig = go.Figure(data=[surface])
+
+    # Update layout for a better view
+    axis_range = data['axis_range']
+    fig.update_layout(title=data['title'], autosize=True,
+                      scene=dict(
+                          xaxis_title='X',
+                          yaxis_title='Y',
+                          zaxis_title='Z',
+                          xaxis=dict(nticks=4, range=axis_range),
+                          yaxis=dict(nticks=4, range=axis_range),
+                          zaxis=dict(nticks=4, range=axis_range),
+                      ),
+                      margin=dict(l=65, r=50, b=65, t=90))
+    return fig
+
+
+@lru_cache(maxsize=2)
+def rigid_rotor_frames(l_max=5, budget=FRAMES_BUDGET):
+    """Every (l, m) surface with l <= l_max as frames of one figure, with a state slider.
+
+    Each frame's grid is thinned to an equal share of `budget`, keeping at least four polar
+    samples per lobe of |Y_lm|. The figure is cached and shared: do not modify it.
+    """
+    import plotly.graph_objects as go
+    import figure_encoding
+
+    states = [(l, m) for l in range(l_max + 1) for m in range(-l, l + 1)]
+    surfaces = [rigid_rotor(l, m) for l, m in states]
+    # One axis and colour range for all states, so switching does not rescale the scene
+    extent = max([0.5] + [data['axis_range'][1] for data in surfaces])
+    axis_range = [-extent, extent]
+
+    frames = []
+    for (l, m), data in zip(states, surfaces):
+        surface = figure_encoding.surface(data['z'], data['x'], data['y'], budget / len(states),
+                                          min_shape=(4 * (l - abs(m) + 1) + 1, 24), colorscale='Viridis',
+                                          cmin=-extent, cmax=extent)
+        frames.append(go.Frame(name=f'{l}, {m}', data=[surface], layout=dict(title=data['title'])))
+
+    fig = go.Figure(data=[frames[0].data[0]], frames=frames)
+    fig.update_layout(title=frames[0].layout.title.text, autosize=True,
+                      scene=dict(
+                          xaxis_title='X',
+                          yaxis_title='Y',
+                          zaxis_title='Z',
+                          xaxis=dict(nticks=4, range=axis_range),
+                          yaxis=dict(nticks=4, range=axis_range),
+                          zaxis=dict(nticks=4, range=axis_range),
+                          aspectmode='cube',
+                      ),
+                      margin=dict(l=65, r=50, b=65, t=90))
+    return state_slider(fig, [frame.name for frame in frames], 'l, m = ')
+
+
+register('harmonic_oscillator', harmonic_oscillator, draw_harmonic_oscillator, 'matplotlib', figsize=(12, 8))
+register('particle_in_a_box', particle_in_a_box, draw_particle_in_a_box, 'matplotlib')
+register('particle_in_a_box_2d', particle_in_a_box_2d, surface_particle_in_a_box_2d, 'plotly',
+         valid=lambda p: p.get('select_by', 'Quantum numbers') in BOX_2D_MODES)
+register('hydrogen_orbitals', hydrogen_orbitals, surface_hydrogen_orbitals, 'plotly')
+register('rigid_rotor', rigid_rotor, surface_rigid_rotor, 'plotly',
+         valid=lambda p: abs(p.get('m', 0)) <= p.get('l', 0))
@@ -0,0 +1,76 @@
+import math
+from functools import lru_cache
+
+import numpy as np
+
+
+def _index(l, m):
+    """Row of (l, m >= 0) in the packed Legendre table."""
+    return l * (l + 1) // 2 + m
+
+
+def normalized_legendre(l_max, cos_theta):
+    """Fully normalized associated Legendre functions for all 0 <= m <= l <= l_max.
+
+    Returns an array of shape ((l_max+1)(l_max+2)/2, len(cos_theta)) where row _index(l, m)
+    holds sqrt((2l+1)/(4 pi) (l-m)!/(l+m)!) P_l^m(cos theta), Condon-Shortley phase included.
+    Built with the normalized recurrences, so no factorials appear and it stays stable for
+    high l where unnormalized P_l^m overflow.
+    """
+    x = np.asarray(cos_theta, dtype=float)
+    sin_theta = np.sqrt(np.clip(1 - x**2, 0, None))
+    table = np.zeros((_index(l_max, l_max) + 1, x.size))
+
+    diag = np.full(x.size, math.sqrt(1 / (4 * math.pi)))
+    for m in range(l_max + 1):
+        if m > 0:
+            diag = -math.sqrt((2 * m + 1) / (2 * m)) * sin_theta * diag
+        table[_index(m, m)] = diag
+        if m == l_max:
+            break
+        prev2, prev1 = diag, math.sqrt(2 * m + 3) * x * diag
+        table[_index(m + 1, m)] = prev1
+        a_prev = math.sqrt(2 * m + 3)
+        for l in range(m + 2, l_max + 1):
+            a = math.sqrt((4 * l**2 - 1) / (l**2 - m**2))
+            prev2, prev1 = prev1, a * (x * prev1 - prev2 / a_prev)
+            table[_index(l, m)] = prev1
+            a_prev = a
+    return table
+
+
+class SphericalHarmonicTable:
+    """All Y_l^m up to l_max on a shared (polar, azimuth) grid, stored compactly.
+
+    Only the packed Legendre rows (one per l, m >= 0) and exp(i m phi) for m >= 0 are kept,
+    so any (l, m) is a row lookup and one outer product instead of a special-function call.
+    """
+
+    def __init__(self, l_max, n_polar=50, n_azimuth=100):
+        self.l_max = l_max
+        self.polar = np.linspace(0, np.pi, n_polar)
+        self.azimuth = np.linspace(0, 2 * np.pi, n_azimuth)
+        self.legendre = normalized_legendre(l_max, np.cos(self.polar))
+        self.phase = np.exp(1j * np.outer(np.arange(l_max + 1), self.azimuth))
+        for array in (self.polar, self.azimuth, self.legendre, self.phase):
+            array.flags.writeable = False
+
+    def __call__(self, l, m):
+        """Y_l^m on the (n_polar, n_azimuth) grid, using Y_l^{-m} = (-1)^m conj(Y_l^m)."""
+        if not 0 <= abs(m) <= l <= self.l_max:
+            raise ValueError(f"need |m| <= l <= {self.l_max}, got l={l}, m={m}")
+        Y = np.outer(self.legendre[_index(l, abs(m))], self.phase[abs(m)])
+        if m < 0:
+            Y = (-1)**m * np.conj(Y)
+        return Y
+
+    def magnitude(self, l, m):
+        """|Y_l^m| on the grid; it does not depend on the azimuth, so no complex product is needed."""
+        row = np.abs(self.legendre[_index(l, abs(m))])
+        return np.broadcast_to(row[:, None], (self.polar.size, self.azimuth.size))
+
+
+@lru_cache(maxsize=8)
+def table(l_max, n_polar=50, n_azimuth=100):
+    """Cached SphericalHarmonicTable, computed once per grid and l_max."""
+    return SphericalHarmonicTable(l_max, n_polar, n_azimuth)
@@ -0,0 +1,182 @@
+import argparse
+import contextlib
+import contextvars
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+# One JSON object per rerun:
+# {"time", "session", "page", "seconds", "spans": {phase: seconds}, "counters": {name: amount}}
+LOG_PATH = os.environ.get('QM_TIMING_LOG', os.path.join(tempfile.gettempdir(), 'qm_apps_timing.jsonl'))
+PERCENTILES = (50, 95, 99)
+# Past this size the log is moved to LOG_PATH + '.1' (replacing the previous one) and restarted
+MAX_LOG_BYTES = 8 * 1024 * 1024
+
+_current = contextvars.ContextVar('timing_trace', default=None)
+_log_lock = threading.Lock()
+
+# Seconds the first import of each page's modules took in this process, keyed by page title
+import_seconds = {}
+
+
+class Trace:
+    """Seconds spent in each phase (compute, figure, rasterize, plotly_json, ...) of one page rerun,
+    plus counters such as the bytes of the figures sent to the browser."""
+
+    def __init__(self, page, session=None):
+        self.page = page
+        self.session = session
+        self.spans = {}
+        self.counters = {}
+        self.seconds = None
+        self._start = time.perf_counter()
+
+    def add(self, phase, seconds):
+        # A phase entered several times in one rerun (e.g. two charts) is summed
+        self.spans[phase] = self.spans.get(phase, 0.0) + seconds
+
+    def count(self, name, amount):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record(self):
+        return dict(time=time.time(), session=self.session, page=self.page, seconds=self.seconds,
+                    spans=self.spans, counters=self.counters)
+
+
+@contextlib.contextmanager
+def span(phase):
+    """Add the time spent in the block to the current rerun's trace; free outside a rerun."""
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(phase, time.perf_counter() - start)
+
+
+def count(name, amount):
+    """Add `amount` to counter `name` of the current rerun's trace, if there is one."""
+    trace = _current.get()
+    if trace is not None:
+        trace.count(name, amount)
+
+
+@contextlib.contextmanager
+def rerun(page, session=None, log_path=LOG_PATH):
+    """Collect the spans of one page run into a Trace and append it to `log_path` (None: don't log)."""
+    trace = Trace(page, session)
+    token = _current.set(trace)
+    try:
+        yield trace
+    finally:
+        _current.reset(token)
+        trace.seconds = time.perf_counter() - trace._start
+        if log_path:
+            append(trace.record(), log_path)
+
+
+def append(record, log_path=LOG_PATH, max_bytes=MAX_LOG_BYTES):
+    """Append one record as a JSON line, rotating the log past max_bytes.
+
+    A read-only or full disk only loses the record.
+    """
+    line = json.dumps(record) + '\n'
+    with _log_lock:
+        try:
+            if os.path.exists(log_path) and os.path.getsize(log_path) > max_bytes:
+                os.replace(log_path, log_path + '.1')
+            with open(log_path, 'a') as f:
+                f.write(line)
+        except OSError:
+            pass
+
+
+def _tail(f, n_lines, block=64 * 1024):
+    """The last n_lines lines of binary file f, read backwards from its end in blocks."""
+    end = f.seek(0, os.SEEK_END)
+    data = b''
+    while end > 0 and data.count(b'\n') <= n_lines:
+        start = max(0, end - block)
+        f.seek(start)
+        data = f.read(end - start) + data
+        end = start
+    lines = data.splitlines()
+    return lines[-n_lines:] if end == 0 else lines[1:][-n_lines:]  # lines[0] may be cut
+
+
+def read_log(log_path=LOG_PATH, max_records=None):
+    """Records from a JSON-lines log, skipping torn or foreign lines.
+
+    With max_records only the end of the file is read, so the cost does not grow with the log.
+    """
+    records = deque(maxlen=max_records)
+    try:
+        with open(log_path, 'rb') as f:
+            for line in f if max_records is None else _tail(f, max_records):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict) and 'page' in record and 'spans' in record:
+                    records.append(record)
+    except FileNotFoundError:
+        pass
+    return list(records)
+
+
+def summarize(records, percentiles=PERCENTILES, field='spans'):
+    """{page: {phase: {'n', 'p50', 'p95', 'p99'}}} in seconds; phase 'total' is the whole rerun.
+
+    field='counters' gives the same percentiles of the counters instead.
+    """
+    samples = {}
+    for record in records:
+        phases = samples.setdefault(record['page'], {})
+        if field == 'spans' and record.get('seconds') is not None:
+            phases.setdefault('total', []).append(record['seconds'])
+        for phase, seconds in record.get(field, {}).items():
+            phases.setdefault(phase, []).append(seconds)
+    return {page: {phase: dict(n=len(values), **{f'p{q}': value for q, value in
+                                                 zip(percentiles, np.percentile(values, percentiles))})
+                   for phase, values in phases.items()}
+            for page, phases in samples.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-page, per-phase rerun time percentiles from timing logs.")
+    parser.add_argument('logs', nargs='*', default=[LOG_PATH + '.1', LOG_PATH],
+                        help="JSON-lines logs (default: %(default)s)")
+    parser.add_argument('--page', help="only this page")
+    args = parser.parse_args(argv)
+
+    records = [record for path in args.logs for record in read_log(path)
+               if args.page is None or record['page'] == args.page]
+    summary = summarize(records)
+    if not summary:
+        print("No timing records")
+        return
+    print(f"{'page':<24s} {'phase':<12s} {'n':>6s}" + ''.join(f"{f'p{q} (ms)':>11s}" for q in PERCENTILES))
+    for page, phases in sorted(summary.items()):
+        for phase, stats in sorted(phases.items(), key=lambda item: -item[1]['p50']):
+            print(f"{page:<24s} {phase:<12s} {stats['n']:>6d}"
+                  + ''.join(f"{stats[f'p{q}'] * 1e3:11.1f}" for q in PERCENTILES))
+
+    counters = summarize(records, field='counters')
+    if any(counters.values()):
+        print(f"\n{'page':<24s} {'counter':<12s} {'n':>6s}" + ''.join(f"{f'p{q}':>11s}" for q in PERCENTILES))
+        for page, names in sorted(counters.items()):
+            for name, stats in sorted(names.items()):
+                print(f"{page:<24s} {name:<12s} {stats['n']:>6d}"
+                      + ''.join(f"{stats[f'p{q}']:11.4g}" for q in PERCENTILES))
+
+
+if __name__ == "__main__":
+    main()
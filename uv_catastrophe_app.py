@@ -1,41 +1,77 @@
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.colors import to_rgba
+from matplotlib import colormaps
+import figure_cache
+import blackbody
 
-# Constants
-c = 3e8  # Speed of light in meters per second
-h = 6.626e-34  # Planck constant in J*s
-k_B = 1.38e-23  # Boltzmann constant in J/K
-
-def planck(lamb, T):
-    """Planck's Law"""
-    exponent = (h * c) / (lamb * k_B * T)
-    return (2 * h * c**2) / (lamb**5) / (np.exp(exponent) - 1)
-
-def plot_radiation(max_lambda, T):
+def plot_radiation(page_figure, max_lambda, temperatures):
     # Wavelength range (in meters)
     lambda_min = 1e-9  # minimum wavelength is 1 nm
     wavelengths = np.linspace(lambda_min, max_lambda, 500)
-    
-    fig, ax = plt.subplots()
-    intensity = planck(wavelengths, T)
-    ax.plot(wavelengths*1e9, intensity, label=f'{T} K', color='blue')  # Convert wavelength to nanometers
-
-    ax.set_xlabel('Wavelength (nm)')
-    ax.set_ylabel('Intensity (W/m^3)')
-    ax.set_title(f'Blackbody Radiation at {T} K')
+
+    # Every curve, peak and swatch colour in one broadcast each
+    intensity = blackbody.planck(wavelengths, temperatures)
+    peaks = blackbody.wien_peak(temperatures)
+    visible = peaks <= max_lambda
+    swatches = blackbody.srgb(temperatures)[None]
+
+    artists = page_figure.artists
+    if page_figure.rebuild_needed(('radiation', len(temperatures))):
+        page_figure.fig.set_layout_engine('constrained')
+        ax, strip = page_figure.fig.subplots(2, 1, height_ratios=[12, 1])
+        artists['ax'], artists['strip'] = ax, strip
+        colors = ['blue'] if len(temperatures) == 1 else colormaps['plasma'](np.linspace(0, 0.9, len(temperatures)))
+        artists['curves'] = [ax.plot(wavelengths*1e9, row, color=color)[0] for row, color in zip(intensity, colors)]
+        artists['peaks'] = ax.scatter([], [], color='black', s=12, zorder=3, label="Wien peaks")
+
+        ax.set_xlabel('Wavelength (nm)')
+        ax.set_ylabel('Intensity (W/m^3)')
+        ax.grid(True)
+        artists['swatches'] = strip.imshow(swatches, aspect='auto')
+        strip.set_yticks([])
+        strip.set_xlabel('Blackbody colour')
+    else:
+        # Update the existing artists instead of building a new figure
+        for curve, row in zip(artists['curves'], intensity):
+            curve.set_data(wavelengths*1e9, row)
+        artists['swatches'].set_data(swatches)
+
+    ax, strip = artists['ax'], artists['strip']
+    artists['peaks'].set_offsets(np.column_stack([peaks[visible]*1e9, blackbody.peak_radiance(temperatures[visible])]))
+    for curve, T in zip(artists['curves'], temperatures):
+        curve.set_label(f'{T:.0f} K' if len(temperatures) <= 10 else '_nolegend_')
+    step = max(1, len(temperatures) // 8)
+    strip.set_xticks(np.arange(len(temperatures))[::step], [f'{T:.0f}' for T in temperatures[::step]])
+
+    if len(temperatures) == 1:
+        ax.set_title(f'Blackbody Radiation at {temperatures[0]:.0f} K')
+    else:
+        ax.set_title(f'Blackbody Radiation from {temperatures[0]:.0f} K to {temperatures[-1]:.0f} K')
     ax.legend()
-    ax.grid(True)
     ax.set_xlim(0, max_lambda*1e9)  # Adjust x-axis limit to slider value
-    ax.set_ylim(0, 1.5e13)  # Adjust y-axis for better visualization
-    
-    return fig
+    ax.set_ylim(0, 1.05 * intensity.max() or 1)  # The hottest curve's maximum within the window
+
+    return page_figure.fig
 
 # Streamlit interface
 st.title("Simulation of Blackbody Radiation")
-T = st.slider("Select Temperature (K)", 300, 10000, 5000, step=100)
+compare = st.checkbox("Compare several temperatures")
+if compare:
+    T_low, T_high = st.slider("Temperature range (K)", 300, 10000, (3000, 7000), step=100)
+    n_curves = st.slider("Number of temperatures", 2, 40, 5)
+    temperatures = np.linspace(T_low, T_high, n_curves)
+else:
+    T = st.slider("Select Temperature (K)", 300, 10000, 5000, step=100)
+    temperatures = np.array([float(T)])
 max_lambda_nm = st.slider("Select Maximum Wavelength (nm)", 10, 3000, 2000)  # Slider in nm
-fig = plot_radiation(max_lambda_nm * 1e-9, T)  # Convert nm to m
-st.pyplot(fig)
+png = figure_cache.cached_png(st.session_state, 'uv_catastrophe', (max_lambda_nm,) + tuple(temperatures),
+                              lambda page_figure: plot_radiation(page_figure, max_lambda_nm * 1e-9, temperatures),  # Convert nm to m
+                              figsize=(6.4, 5.2))
+st.image(png)
 
+st.dataframe({
+    'T (K)': temperatures,
+    'Wien peak (nm)': blackbody.wien_peak(temperatures) * 1e9,
+    'Exitance σT⁴ (MW/m²)': blackbody.exitance(temperatures) / 1e6,
+    'Colour': blackbody.hex_colors(temperatures),
+}, hide_index=True)